@@ -13,6 +13,9 @@ CONST_GAMEBOARD_ROWS_EXPERT = 16
 CONST_GAMEBOARD_COLS_EXPERT = 30
 CONST_GAMEBOARD_MINES_EXPERT = 99
 
+# Set to False to play without printing the boards after every move
+CONST_VERBOSE = True
+
 # Main application logic
 if __name__ == "__main__":
 
@@ -39,21 +42,24 @@ if __name__ == "__main__":
 
 
     # Create a new instance of the Minesweeper game board
-    NewAI = MineSweeperAI(CONST_GAMEBOARD_ROWS, CONST_GAMEBOARD_COLS, CONST_GAMEBOARD_MINES)
-    NewGameboard = MineSweeperBoard(CONST_GAMEBOARD_ROWS, CONST_GAMEBOARD_COLS, CONST_GAMEBOARD_MINES)
-    NewGameboard.print()
+    NewAI = MineSweeperAI(CONST_GAMEBOARD_ROWS, CONST_GAMEBOARD_COLS, CONST_GAMEBOARD_MINES, verbose=CONST_VERBOSE)
+    NewGameboard = MineSweeperBoard(CONST_GAMEBOARD_ROWS, CONST_GAMEBOARD_COLS, CONST_GAMEBOARD_MINES, verbose=CONST_VERBOSE)
+    if CONST_VERBOSE:
+      NewGameboard.print()
     # NewGameboard.printDebug()
     # While the game is not over, the AI should keep
     # being prompted for their next move
     while not NewGameboard.isGameOver():
-      NewAI.updateAIViewBoard(NewGameboard.getAIBoard())
-      xCoordinate, yCoordinate = NewAI.makeMove()
-      print('AI\'s move: {},{}'.format(xCoordinate, yCoordinate))
+      NewAI.updateAIViewBoard(NewGameboard.getAIBoard(), NewGameboard.getChangedTiles())
+      moves = NewAI.makeMoves()
+      if CONST_VERBOSE:
+        print('AI\'s moves: {}'.format(' '.join('{},{}'.format(xCoordinate, yCoordinate) for xCoordinate, yCoordinate in moves)))
       #xCoordinate = int(input('Please enter the x component of the tile: '))
       #yCoordinate = int(input('Please enter the y component of the tile: '))
       try:
-        NewGameboard.makeMove(xCoordinate, yCoordinate)
-        NewGameboard.print()
+        NewGameboard.makeMoves(moves)
+        if CONST_VERBOSE:
+          NewGameboard.print()
         # NewGameboard.printDebug()
       except ValueError as error:
         print(error)
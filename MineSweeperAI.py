@@ -1,14 +1,51 @@
-from random import randint
+from functools import reduce
+from math import gcd
+from random import Random
+from time import monotonic, perf_counter
 from constraint import *
+from MineSweeperArrays import np, requireNumpy, decodeSymbol, encodeSymbol, encodeBoard, neighbourhoodSum, UNKNOWN, MARKED_MINE
+from MineSweeperCache import ComponentCache, sharedComponentCache
+from MineSweeperCounter import CountingTimeout, countSolutions
+from MineSweeperNeighbours import getNeighbourTable, getSymbolHistogram
+from MineSweeperSparse import SparseBoard
+from MineSweeperStats import SolverStats
+from MineSweeperStrategies import buildPipeline
 
 class MineSweeperAI:
 
-  def __init__(self, xDimension, yDimension, numberMines):
+  def __init__(self, xDimension, yDimension, numberMines, componentCache=None, useArrays=False, timeBudget=None, instrument=False, verbose=True, seed=None, rng=None, sparse=False, recorder=None, pipeline=None):
     #Initializes the AI Minesweeper AI
     self.xDimension = xDimension
     self.yDimension = yDimension
     self.numberMines = numberMines
 
+    # When verbose is off the AI prints nothing, and never formats its board
+    self.verbose = verbose
+
+    # Random number generator used for guesses; pass a seed or a random.Random
+    # instance so that the same guesses are made every time a game is replayed.
+    # A seed is salted first so that a board and an AI given the same seed draw
+    # independent numbers (unsalted, the AI's first guess is the board's first mine)
+    self.seed = seed
+    self.random = rng if rng is not None else Random(None if seed is None else 'ai:{}'.format(seed))
+
+    # In sparse mode (for very large boards) the AI only stores the tiles it
+    # has seen, neighbours are computed on demand and no step of a move scans
+    # the whole board, so a move costs time in proportion to the frontier
+    self.sparse = sparse
+    if self.sparse and useArrays:
+      raise ValueError('sparse boards cannot be array-backed')
+
+    # Neighbour tables shared by every board of the same shape (computed on
+    # demand for sparse and large boards)
+    self.neighbourIndices = getNeighbourTable(xDimension, yDimension, asIndices=True, lazy=self.sparse)
+    self.neighbourCoordinates = getNeighbourTable(xDimension, yDimension, lazy=self.sparse)
+    self.degreeTwoCoordinates = getNeighbourTable(xDimension, yDimension, 2, lazy=self.sparse)
+
+    # Solved frontier components, keyed by their shape so that the same
+    # configuration is only counted once (shared between AIs by default)
+    self.componentCache = sharedComponentCache if componentCache is None else componentCache
+
     # AI gameboard view consists of the following symbols
     # -   X = Unknown (not yet selected) tile
     # -   * = Mine location
@@ -17,6 +54,67 @@ class MineSweeperAI:
     self.AIBoard = None
     self.moveQueue = []
 
+    # Number of unknown tiles, kept up to date as tiles change along with the
+    # number of tiles marked as mines (markedMines), so guesses never count them
+    self.unknownTiles = xDimension * yDimension
+
+    # Tile indices queued as safe since the move queue was last empty, so that
+    # a tile deduced by several tiers is only queued once
+    self.queuedTiles = set()
+
+    # In array-backed mode the board is mirrored into a small-int NumPy array
+    # (encoded as described in MineSweeperArrays) for whole-board checks
+    self.useArrays = useArrays
+    self.AIBoardArray = None
+    if self.useArrays:
+      requireNumpy()
+
+    # Deduction pipeline: the stages tried in order for every move (see
+    # MineSweeperStrategies), given as stage objects and/or built-in tier
+    # names. lastTier names the stage that produced the most recent moves
+    # ('guess' when none was certain), and stageReports says, for every stage
+    # tried during the last move, whether it ran, the tiles it queued as safe,
+    # marked as mines or guessed (collected in foundTiles while a stage runs),
+    # how many tiles that is in all and how long it took
+    self.builtinTiers = {
+      'firstDegree': self.__firstDegreeSolver,
+      'secondDegree': self.__secondDegreeSolver,
+      'thirdDegree': self.__thirdDegreeSolver,
+      'linear': self.__linearSolver,
+      'global': self.__globalSolver,
+      'guess': self.__guessSolver,
+    }
+    self.pipeline = buildPipeline(pipeline)
+    self.lastTier = None
+    self.stageReports = []
+    self.markedMines = 0
+    self.foundTiles = {'safe': [], 'mines': [], 'guesses': []}
+
+    # Optional per-move time budget in seconds. Tiers stop at the deadline and
+    # keep what they have proven so far, and the move falls through to a
+    # guess; timedOutTier names the tier that ran out of time (or, when the
+    # budget was used up between tiers, the first tier skipped), if any
+    self.timeBudget = timeBudget
+    self.deadline = None
+    self.timedOutTier = None
+
+    # Optional instrumentation, off by default: per-tier call counts, wall
+    # time, constraints built, solutions counted and deductions produced
+    self.stats = SolverStats() if instrument else None
+    self.tierCounts = {'constraints': 0, 'solutions': 0, 'deductions': 0}
+
+    # Optional event log (see MineSweeperReplay) that the tier behind every
+    # batch of moves is appended to
+    self.recorder = recorder
+
+    # The frontier is tracked incrementally as tiles change, as the indices
+    # (x * yDimension + y) of the numbered tiles that still border unknown tiles
+    self.frontierNumbers = set()
+
+    # Deductions of small constraint groups, keyed by the constraints' values
+    # and scopes, so groups left unchanged by a move are not solved again
+    self.groupCache = ComponentCache(100000)
+
   def print(self, gameboard=None):
     #Print the AI's mind gameboard
     board = self.AIBoard if (gameboard == None) else gameboard
@@ -27,235 +125,330 @@ class MineSweeperAI:
       print('\n'.join([' '.join([str(cell) for cell in row]) for row in board]))
     print('\n')
 
-  def updateAIViewBoard(self, AIBoard):
+  def __log(self, message):
+    #Prints a message when the AI is verbose
+    if self.verbose:
+      print(message)
+
+  def updateAIViewBoard(self, AIBoard, changedTiles=None):
     #Updates the AI's mental board state with the actual board state
+    # The board may be given as a list of lists, an array-backed board or a
+    # sparse board. If the board reports which tiles changed since the last update, only
+    # those tiles are copied, otherwise the whole board is compared
+    if np is not None and isinstance(AIBoard, np.ndarray):
+      readTile = lambda x, y: decodeSymbol(AIBoard[x, y])
+    else:
+      readTile = lambda x, y: AIBoard[x][y]
+    if self.sparse and self.AIBoard == None:
+      self.AIBoard = SparseBoard(self.xDimension, self.yDimension, 'X')
     if self.AIBoard == None:
-      self.AIBoard = [row[:] for row in AIBoard]
+      self.AIBoard = [[readTile(x, y) for y in range(self.yDimension)] for x in range(self.xDimension)]
+      if self.useArrays:
+        self.AIBoardArray = encodeBoard(self.AIBoard)
+      self.unknownTiles = sum(row.count('X') for row in self.AIBoard)
+      self.markedMines = sum(row.count('*') for row in self.AIBoard)
+      changedIndices = range(self.xDimension * self.yDimension)
     else:
-      for x, row in enumerate(AIBoard):
-        for y, value in enumerate(row):
-          if self.AIBoard[x][y] != '*':
-            self.AIBoard[x][y] = AIBoard[x][y]
+      if changedTiles == None:
+        # A sparse board can list its known tiles; any other board is compared in full
+        if isinstance(AIBoard, SparseBoard):
+          changedTiles = list(AIBoard.tiles)
+        else:
+          changedTiles = [(x, y) for x in range(self.xDimension) for y in range(self.yDimension)]
+      changedIndices = []
+      for x, y in changedTiles:
+        value = readTile(x, y)
+        if self.AIBoard[x][y] != '*' and self.AIBoard[x][y] != value:
+          self.__setTile(x, y, value)
+          changedIndices.append(x * self.yDimension + y)
+    self.__refreshFrontier(changedIndices)
 
-  def __coordinateCheck(self, x, y):
-    #Checks to make sure that the coordinate pair is within bounds of the board
-    if x < 0 or x >= self.xDimension:
-      return False
-    if y < 0 or y >= self.yDimension:
+  def __setTile(self, x, y, value):
+    #Writes a tile of the AI's mental board state, keeping the array mirror and the tile counts in sync
+    previousValue = self.AIBoard[x][y]
+    self.unknownTiles += (value == 'X') - (previousValue == 'X')
+    self.markedMines += (value == '*') - (previousValue == '*')
+    self.AIBoard[x][y] = value
+    if self.useArrays:
+      self.AIBoardArray[x, y] = encodeSymbol(value)
+
+  def __getAdjIndices(self, index):
+    #Returns the indices of all tiles adjacent to the given tile index that are within the board
+    return self.neighbourIndices[index]
+
+  def __getAdjSummary(self, index):
+    #Returns the symbol histogram of a tile's neighbours and the indices of its unknown neighbours
+    histogram = {}
+    unknownIndices = []
+    for adjIndex, (adjX, adjY) in zip(self.neighbourIndices[index], self.neighbourCoordinates[index]):
+      symbol = self.AIBoard[adjX][adjY]
+      histogram[symbol] = histogram.get(symbol, 0) + 1
+      if symbol == 'X':
+        unknownIndices.append(adjIndex)
+    return histogram, unknownIndices
+
+  def __getTile(self, index):
+    #Returns the AI's view of the tile at the given tile index
+    x, y = divmod(index, self.yDimension)
+    return self.AIBoard[x][y]
+
+  def __refreshFrontier(self, changedIndices):
+    #Updates the frontier for the changed tiles and their neighbours
+    affectedIndices = set(changedIndices)
+    # When every tile changed (the first update) there are no neighbours to add
+    if len(affectedIndices) != self.xDimension * self.yDimension:
+      for index in changedIndices:
+        affectedIndices.update(self.__getAdjIndices(index))
+    for index in affectedIndices:
+      value = self.__getTile(index)
+      if isinstance(value, int) and 'X' in getSymbolHistogram(self.AIBoard, self.neighbourCoordinates[index]):
+        self.frontierNumbers.add(index)
+      else:
+        self.frontierNumbers.discard(index)
+
+  def __markMine(self, index):
+    #Marks the tile at the given tile index as a mine in the AI's mental board state
+    x, y = divmod(index, self.yDimension)
+    self.__setTile(x, y, '*')
+    self.__refreshFrontier([index])
+
+  def __countStat(self, field, amount):
+    #Adds to a counter of the tier currently running when instrumentation is on
+    if self.stats is not None:
+      self.tierCounts[field] += amount
+
+  def __applyDeduction(self, index, value):
+    #Queues a tile proven safe (value 0) or marks a tile proven to be a mine (value 1)
+    # Returns whether the deduction was new: tiers work from constraints built
+    # before their own deductions, so a tile may be deduced again once it is marked
+    if self.__getTile(index) != 'X' or index in self.queuedTiles:
       return False
-    return True
-  
-  def __chooseRandomMove(self):
-    #Chooses a random, valid move to make
-    randXCoordinate = randint(0, self.xDimension - 1)
-    randYCoordinate = randint(0, self.yDimension - 1)
-    if self.AIBoard[randXCoordinate][randYCoordinate] == 'X':
-      self.moveQueue.append((randXCoordinate, randYCoordinate))
-      return True
+    self.__countStat('deductions', 1)
+    coordinate = divmod(index, self.yDimension)
+    if value == 0:
+      self.moveQueue.append(coordinate)
+      self.queuedTiles.add(index)
+      self.foundTiles['safe'].append(coordinate)
     else:
-      return self.__chooseRandomMove()
+      self.__markMine(index)
+      self.foundTiles['mines'].append(coordinate)
+    return True
+
+  def applyDeduction(self, x, y, value):
+    #Queues the tile at (x, y) as safe (value 0) or marks it as a mine (value 1), for custom pipeline stages
+    # Returns False if the tile is no longer unknown or is already queued
+    return self.__applyDeduction(x * self.yDimension + y, value)
 
-  def __twoDegreeIsland(self, x, y):
+  def getConstraints(self, skipIslands=True):
+    #Returns the constraints of every frontier number, for custom pipeline stages
+    # Constraints are (tile index, number of unknown mines, sorted tuple of
+    # unknown tile indices), with tile indices x * yDimension + y
+    return self.__getAllConstraints(skipIslands)
+
+  def isOutOfTime(self):
+    #Determines if the time budget of the current move has been used up, for custom pipeline stages
+    return self.__outOfTime()
+
+  def __chooseRandomMove(self, candidates):
+    #Chooses a random move out of a list of equally good candidate tiles
+    return self.__queueGuess(self.random.choice(candidates))
+
+  def __queueGuess(self, coordinate):
+    #Queues a guessed tile
+    self.moveQueue.append(coordinate)
+    self.foundTiles['guesses'].append(coordinate)
+    return True
+
+  def __outOfTime(self):
+    #Determines if the time budget of the current move has been used up
+    return self.deadline is not None and monotonic() > self.deadline
+
+  def __chooseGuessMove(self):
+    #Chooses the unknown tile with the lowest probability of holding a mine
+    # Without time left to count the frontier, any unknown tile is chosen
+    probabilities = {}
+    interiorCount = 0
+    if not self.__outOfTime():
+      try:
+        if self.sparse:
+          probabilities, interiorProbability, interiorCount, frontierTiles = self.__getProbabilities()
+        else:
+          probabilities = self.getMineProbabilities()
+      except CountingTimeout:
+        pass
+    if len(probabilities) == 0 and interiorCount == 0:
+      return self.__chooseRandomUnknown()
+    risks = list(probabilities.values()) + ([interiorProbability] if interiorCount != 0 else [])
+    lowestRisk = min(risks)
+    candidates = [coordinate for coordinate, probability in probabilities.items() if probability == lowestRisk]
+    # Sparse boards do not list their interior tiles, so when those are among
+    # the safest they are picked from with the right odds without listing them
+    if interiorCount != 0 and interiorProbability == lowestRisk:
+      if self.random.randrange(len(candidates) + interiorCount) >= len(candidates):
+        return self.__chooseRandomUnknown(frontierTiles)
+    return self.__chooseRandomMove(sorted(candidates))
+
+  def __chooseRandomUnknown(self, excludedIndices=()):
+    #Chooses a random unknown tile, leaving out the given tile indices
+    numTiles = self.xDimension * self.yDimension
+    if self.sparse:
+      # Sample tiles rather than listing every unknown one, and only fall
+      # back to listing them if unknown tiles have become too rare to hit
+      for attempt in range(1000):
+        index = self.random.randrange(numTiles)
+        if index not in excludedIndices and self.__getTile(index) == 'X':
+          return self.__queueGuess(divmod(index, self.yDimension))
+    unknownTiles = [divmod(index, self.yDimension) for index in range(numTiles)
+                    if index not in excludedIndices and self.__getTile(index) == 'X']
+    if len(unknownTiles) == 0:
+      return False
+    return self.__chooseRandomMove(unknownTiles)
+
+  def __onlyUnknowns(self, histogram):
+    #Determines if every tile counted in a neighbour histogram is unknown, ignoring revealed mines
+    return histogram.get('X', 0) == sum(count for symbol, count in histogram.items() if symbol != 'x')
+
+  def __twoDegreeIsland(self, index):
     #Determines if a tile is a two degree island
-    numAdjMines, _ = self.__getNumberAdj(x, y, '*')
-    numAdjUnknown, _ = self.__getNumberAdj(x, y, 'X')
-    numAdj0, _ = self.__getNumberAdj(x, y, '-')
-    numAdj1, _ = self.__getNumberAdj(x, y, 1)
-    numAdj2, _ = self.__getNumberAdj(x, y, 2)
-    numAdj3, _ = self.__getNumberAdj(x, y, 3)
-    numAdj4, _ = self.__getNumberAdj(x, y, 4)
-    numAdj5, _ = self.__getNumberAdj(x, y, 5)
-    numAdj6, _ = self.__getNumberAdj(x, y, 6)
-    numAdj7, _ = self.__getNumberAdj(x, y, 7)
-    numAdj8, _ = self.__getNumberAdj(x, y, 8)
-    if (float(numAdjUnknown) / (numAdj0 + numAdj1 + numAdj2 + numAdj3 + numAdj4 + numAdj5 + numAdj6 + numAdj7 + numAdj8 + numAdjMines + numAdjUnknown) == 1):
-      numAdjMines2, _ = self.__getNumberAdj(x, y, '*', 2)
-      numAdjUnknown2, _ = self.__getNumberAdj(x, y, 'X', 2)
-      numAdj02, _ = self.__getNumberAdj(x, y, '-', 2)
-      numAdj12, _ = self.__getNumberAdj(x, y, 1, 2)
-      numAdj22, _ = self.__getNumberAdj(x, y, 2, 2)
-      numAdj32, _ = self.__getNumberAdj(x, y, 3, 2)
-      numAdj42, _ = self.__getNumberAdj(x, y, 4, 2)
-      numAdj52, _ = self.__getNumberAdj(x, y, 5, 2)
-      numAdj62, _ = self.__getNumberAdj(x, y, 6, 2)
-      numAdj72, _ = self.__getNumberAdj(x, y, 7, 2)
-      numAdj82, _ = self.__getNumberAdj(x, y, 8, 2)
-      return (float(numAdjUnknown2) / (numAdj02 + numAdj12 + numAdj22 + numAdj32 + numAdj42 + numAdj52 + numAdj62 + numAdj72 + numAdj82 + numAdjMines2 + numAdjUnknown2) == 1)
+    if self.__onlyUnknowns(getSymbolHistogram(self.AIBoard, self.neighbourCoordinates[index])):
+      return self.__onlyUnknowns(getSymbolHistogram(self.AIBoard, self.degreeTwoCoordinates[index]))
     else:
       return False
 
-  def __formulateConstraintEq(self, x, y):
-    #Creates a constaint equation for the tile located at (x,y)
+  def __formulateConstraintEq(self, index, skipIslands=True):
+    #Creates a constaint equation for the tile at the given tile index
+    # Constraints are (tile index, number of unknown mines, sorted tuple of
+    # unknown tile indices), so scopes can be compared as plain integers
+    x, y = divmod(index, self.yDimension)
     if self.AIBoard[x][y] == 'X' or self.AIBoard[x][y] == '-' or self.AIBoard[x][y] == '*':
       return None
     tileValue = self.AIBoard[x][y]
-    variablesList = []
-    mOccurrences, mCoordinates = self.__getNumberAdj(x, y, '*')
-    fOccurrences, fCoordinates = self.__getNumberAdj(x, y, 'X')
-    if fOccurrences == 0:
+    histogram, unknownIndices = self.__getAdjSummary(index)
+    if len(unknownIndices) == 0:
       return None
-    if self.__twoDegreeIsland(x, y):
+    if skipIslands and self.__twoDegreeIsland(index):
       return None
-    tileValue -= mOccurrences
-    for fCoordinate in fCoordinates:
-      variablesList.append(','.join(map(str, fCoordinate)))
-    return ( (x,y), tileValue, variablesList )
+    tileValue -= histogram.get('*', 0)
+    return ( index, tileValue, tuple(sorted(unknownIndices)) )
 
-  def __getAllConstraints(self):
+  def __getAllConstraints(self, skipIslands=True):
     #Generates a list of constraints for all fringe tiles on the board with adjacent empty spaces
     constraintList = []
-    for x, row in enumerate(self.AIBoard):
-      for y, value in enumerate(row):
-        constraintEq = self.__formulateConstraintEq(x, y)
-        if constraintEq != None:
-          constraintList.append(constraintEq)
+    for index in sorted(self.frontierNumbers):
+      constraintEq = self.__formulateConstraintEq(index, skipIslands)
+      if constraintEq != None:
+        constraintList.append(constraintEq)
+    self.__countStat('constraints', len(constraintList))
     return constraintList
 
-  def __getNumberAdj(self, x, y, character, degree=1):
-    totalOccurrences = 0
-    occurrenceCoordinates = []
-    if (self.__coordinateCheck(x, y-degree)):
-      if self.AIBoard[x][y-degree] == character:
-        totalOccurrences += 1
-        occurrenceCoordinates.append( (x,y-degree) )
-    ## Check the tile to the north-west
-    if (self.__coordinateCheck(x-degree, y-degree)):
-      if self.AIBoard[x-degree][y-degree] == character:
-        totalOccurrences += 1
-        occurrenceCoordinates.append( (x-degree,y-degree) )
-    ## Check the tile to the north
-    if (self.__coordinateCheck(x-degree, y)):
-      if self.AIBoard[x-degree][y] == character:
-        totalOccurrences += 1
-        occurrenceCoordinates.append( (x-degree,y) )
-    ## Check the tile to the north-east
-    if (self.__coordinateCheck(x-degree, y+degree)):
-      if self.AIBoard[x-degree][y+degree] == character:
-        totalOccurrences += 1
-        occurrenceCoordinates.append( (x-degree,y+degree) )
-    ## Check the tile to the east
-    if (self.__coordinateCheck(x, y+degree)):
-      if self.AIBoard[x][y+degree] == character:
-        totalOccurrences += 1
-        occurrenceCoordinates.append( (x,y+degree) )
-    ## Check the tile to the south-east
-    if (self.__coordinateCheck(x+degree, y+degree)):
-      if self.AIBoard[x+degree][y+degree] == character:
-        totalOccurrences += 1
-        occurrenceCoordinates.append( (x+degree,y+degree) )
-    ## Check the tile to the south
-    if (self.__coordinateCheck(x+degree, y)):
-      if self.AIBoard[x+degree][y] == character:
-        totalOccurrences += 1
-        occurrenceCoordinates.append( (x+degree,y) )
-    ## Check the tile to the south-west
-    if (self.__coordinateCheck(x+degree, y-degree)):
-      if self.AIBoard[x+degree][y-degree] == character:
-        totalOccurrences += 1
-        occurrenceCoordinates.append( (x+degree,y-degree) )
-    return totalOccurrences, occurrenceCoordinates
-
   def __firstDegreeSolver(self):
+    if self.useArrays:
+      return self.__firstDegreeArraySolver()
     wasUsed = False
-    for x, row in enumerate(self.AIBoard):
-      for y, value in enumerate(row):
-        if value != 'X' and value != '-' and value != '*':
-          mOccurrences, mCoordinates = self.__getNumberAdj(x, y, '*')
-          fOccurrences, fCoordinates = self.__getNumberAdj(x, y, 'X')
-          if value - mOccurrences == 0:
-            # Rest must be OK spaces
-            for fCoordinate in fCoordinates:
-              self.moveQueue.append(fCoordinate)
-              wasUsed = True
-          elif value - mOccurrences == fOccurrences:
-            # Rest must be mines
-            for fCoordinate in fCoordinates:
-              fCX = fCoordinate[0]
-              fCY = fCoordinate[1]
-              self.AIBoard[fCX][fCY] = '*'
-              wasUsed = True
+    for index in sorted(self.frontierNumbers):
+      if self.__outOfTime():
+        break
+      self.__countStat('constraints', 1)
+      histogram, unknownIndices = self.__getAdjSummary(index)
+      value = self.__getTile(index) - histogram.get('*', 0)
+      if value == 0:
+        # Rest must be OK spaces
+        for unknownIndex in unknownIndices:
+          if self.__applyDeduction(unknownIndex, 0):
+            wasUsed = True
+      elif value == len(unknownIndices):
+        # Rest must be mines
+        for unknownIndex in unknownIndices:
+          if self.__applyDeduction(unknownIndex, 1):
+            wasUsed = True
     return wasUsed
 
-  def __secondDegreeSolver(self):
+  def __firstDegreeArraySolver(self):
+    #Runs the first degree checks over the whole board at once using the array mirror
     wasUsed = False
-    constraintProblem = Problem()
-    constraintsList = self.__getAllConstraints()
-    for x in range(0,len(constraintsList) - 1):
-      for y in range(x+1, len(constraintsList)):
-        constraintProblem.reset()
-        constraint1 = constraintsList[x]
-        constraint2 = constraintsList[y]
-        uniqueVariables = list(set(constraint1[2] + constraint2[2]))
-        constraintProblem.addVariables(uniqueVariables, [0,1])
-        constraintProblem.addConstraint(ExactSumConstraint(constraint1[1]), constraint1[2])
-        constraintProblem.addConstraint(ExactSumConstraint(constraint2[1]), constraint2[2])
-        solutions = constraintProblem.getSolutions()
-        if len(solutions) != 0:
-          for variable in uniqueVariables:
-            firstVal = solutions[0][variable]
-            isConsistent = True
-            for solution in solutions:
-              if solution[variable] != firstVal:
-                isConsistent = False
-                break
-            if isConsistent:
-              decodedX = int(variable.split(',')[0])
-              decodedY = int(variable.split(',')[1])
-              if firstVal == 0:
-                self.moveQueue.append((decodedX, decodedY))
-                wasUsed = True
-              if firstVal == 1:
-                self.AIBoard[decodedX][decodedY] = '*'
-                wasUsed = True
+    board = self.AIBoardArray
+    unknown = board == UNKNOWN
+    numbered = board > 0
+    adjUnknown = neighbourhoodSum(unknown)
+    minesLeft = board - neighbourhoodSum(board == MARKED_MINE)
+    # Numbered tiles whose mines are all found, or whose unknowns must all be mines
+    self.__countStat('constraints', int(np.count_nonzero(numbered & (adjUnknown > 0))))
+    satisfied = numbered & (adjUnknown > 0) & (minesLeft == 0)
+    saturated = numbered & (adjUnknown > 0) & (minesLeft == adjUnknown)
+    safeTiles = unknown & (neighbourhoodSum(satisfied) > 0)
+    mineTiles = unknown & (neighbourhoodSum(saturated) > 0)
+    for x, y in np.argwhere(safeTiles).tolist():
+      if self.__applyDeduction(x * self.yDimension + y, 0):
+        wasUsed = True
+    for x, y in np.argwhere(mineTiles).tolist():
+      if self.__applyDeduction(x * self.yDimension + y, 1):
+        wasUsed = True
     return wasUsed
 
-  def __thirdDegreeSolver(self):
-    wasUsed = False
-    constraintProblem = Problem()
-    constraintsList = self.__getAllConstraints()
-    for x in range(0,len(constraintsList) - 2):
-      for y in range(x+1, len(constraintsList) - 1):
-        for z in range(x+2, len(constraintsList)):
-          constraintProblem.reset()
-          constraint1 = constraintsList[x]
-          constraint2 = constraintsList[y]
-          constraint3 = constraintsList[z]
-          uniqueVariables = list(set(constraint1[2] + constraint2[2] + constraint3[2]))
-          constraintProblem.addVariables(uniqueVariables, [0,1])
-          constraintProblem.addConstraint(ExactSumConstraint(constraint1[1]), constraint1[2])
-          constraintProblem.addConstraint(ExactSumConstraint(constraint2[1]), constraint2[2])
-          constraintProblem.addConstraint(ExactSumConstraint(constraint3[1]), constraint3[2])
-          solutions = constraintProblem.getSolutions()
-          if len(solutions) != 0:
-            for variable in uniqueVariables:
-              firstVal = solutions[0][variable]
-              isConsistent = True
-              for solution in solutions:
-                if solution[variable] != firstVal:
-                  isConsistent = False
-                  break
-              if isConsistent:
-                decodedX = int(variable.split(',')[0])
-                decodedY = int(variable.split(',')[1])
-                if firstVal == 0:
-                  self.moveQueue.append((decodedX, decodedY))
-                  wasUsed = True
-                if firstVal == 1:
-                  self.AIBoard[decodedX][decodedY] = '*'
-                  wasUsed = True
-    return wasUsed
-  
-  def __globalSolver(self):
-    wasUsed = False
+  def __getOverlapGraph(self, constraintsList):
+    #Returns, for every constraint, the positions of the other constraints sharing an unknown tile with it
+    constraintsOfTile = {}
+    for position, constraint in enumerate(constraintsList):
+      for variable in constraint[2]:
+        constraintsOfTile.setdefault(variable, []).append(position)
+    overlapGraph = [set() for constraint in constraintsList]
+    for positions in constraintsOfTile.values():
+      for position in positions:
+        overlapGraph[position].update(positions)
+    for position, neighbours in enumerate(overlapGraph):
+      neighbours.discard(position)
+    return overlapGraph
+
+  def __pairDeductions(self, constraint1, constraint2):
+    #Returns the (tile index, value) pairs forced by two overlapping constraints
+    scope1 = set(constraint1[2])
+    scope2 = set(constraint2[2])
+    common = scope1 & scope2
+    only1 = scope1 - common
+    only2 = scope2 - common
+    # Bounds on the number of mines among the shared tiles
+    commonMin = max(0, constraint1[1] - len(only1), constraint2[1] - len(only2))
+    commonMax = min(len(common), constraint1[1], constraint2[1])
+    if commonMin > commonMax:
+      return []
+    deductions = []
+    for only, value in ((only1, constraint1[1]), (only2, constraint2[1])):
+      if len(only) == 0:
+        continue
+      if value - commonMin == 0:
+        deductions.extend((variable, 0) for variable in only)
+      elif value - commonMax == len(only):
+        deductions.extend((variable, 1) for variable in only)
+    if commonMax == 0:
+      deductions.extend((variable, 0) for variable in common)
+    elif commonMin == len(common):
+      deductions.extend((variable, 1) for variable in common)
+    return deductions
+
+  def __getGroupKey(self, constraints):
+    #Returns a key identifying a group of constraints by their values and scopes
+    return tuple(sorted((constraint[1], constraint[2]) for constraint in constraints))
+
+  def __lookupGroupDeductions(self, constraints, solveGroup):
+    #Returns the memoized deductions of a constraint group, solving it if it has not been seen
+    groupKey = self.__getGroupKey(constraints)
+    deductions = self.groupCache.get(groupKey)
+    if deductions is None:
+      deductions = solveGroup(*constraints)
+      self.groupCache.put(groupKey, deductions)
+    return deductions
+
+  def __tripleDeductions(self, constraint1, constraint2, constraint3):
+    #Returns the (tile index, value) pairs forced by three connected constraints
     constraintProblem = Problem()
-    constraintsList = self.__getAllConstraints()
-    uniqueVariables = []
-    for constraint in constraintsList:
-      uniqueVariables = uniqueVariables + constraint[2]
-      constraintProblem.addConstraint(ExactSumConstraint(constraint[1]), constraint[2])
-    uniqueVariables = list(set(uniqueVariables))
+    uniqueVariables = list(set(constraint1[2] + constraint2[2] + constraint3[2]))
     constraintProblem.addVariables(uniqueVariables, [0,1])
+    constraintProblem.addConstraint(BinarySumConstraint(constraint1[1]), constraint1[2])
+    constraintProblem.addConstraint(BinarySumConstraint(constraint2[1]), constraint2[2])
+    constraintProblem.addConstraint(BinarySumConstraint(constraint3[1]), constraint3[2])
     solutions = constraintProblem.getSolutions()
+    self.__countStat('solutions', len(solutions))
+    deductions = []
     if len(solutions) != 0:
       for variable in uniqueVariables:
         firstVal = solutions[0][variable]
@@ -265,41 +458,406 @@ class MineSweeperAI:
             isConsistent = False
             break
         if isConsistent:
-          decodedX = int(variable.split(',')[0])
-          decodedY = int(variable.split(',')[1])
-          if firstVal == 0:
-            self.moveQueue.append((decodedX, decodedY))
+          deductions.append((variable, firstVal))
+    return deductions
+
+  def __secondDegreeSolver(self):
+    wasUsed = False
+    constraintsList = self.__getAllConstraints()
+    overlapGraph = self.__getOverlapGraph(constraintsList)
+    # Only constraints sharing an unknown tile can tell each other anything
+    for x, neighbours in enumerate(overlapGraph):
+      if self.__outOfTime():
+        break
+      for y in sorted(neighbours):
+        if y <= x:
+          continue
+        pair = (constraintsList[x], constraintsList[y])
+        for variable, value in self.__lookupGroupDeductions(pair, self.__pairDeductions):
+          if self.__applyDeduction(variable, value):
             wasUsed = True
-          if firstVal == 1:
-            self.AIBoard[decodedX][decodedY] = '*'
+    return wasUsed
+
+  def __thirdDegreeSolver(self):
+    wasUsed = False
+    constraintsList = self.__getAllConstraints()
+    overlapGraph = self.__getOverlapGraph(constraintsList)
+    # Only triples that are connected through shared unknown tiles are
+    # considered, each one exactly once
+    triples = set()
+    for x, neighbours in enumerate(overlapGraph):
+      for y in neighbours:
+        for z in neighbours | overlapGraph[y]:
+          if z != x and z != y:
+            triples.add(tuple(sorted((x, y, z))))
+    for x, y, z in sorted(triples):
+      if self.__outOfTime():
+        break
+      triple = (constraintsList[x], constraintsList[y], constraintsList[z])
+      for variable, value in self.__lookupGroupDeductions(triple, self.__tripleDeductions):
+        if self.__applyDeduction(variable, value):
+          wasUsed = True
+    return wasUsed
+  
+  def __splitComponents(self, constraintsList):
+    #Groups constraints into independent components that share no unknown tiles
+    componentOf = {}
+    components = []
+    for constraint in constraintsList:
+      # Collect every existing component this constraint touches
+      touched = []
+      for variable in constraint[2]:
+        component = componentOf.get(variable)
+        if component is not None and component not in touched:
+          touched.append(component)
+      if len(touched) == 0:
+        merged = [[], set()]
+        components.append(merged)
+      else:
+        # Merge all touched components into the largest one
+        touched.sort(key=lambda component: len(component[0]), reverse=True)
+        merged = touched[0]
+        for component in touched[1:]:
+          merged[0].extend(component[0])
+          merged[1].update(component[1])
+          for variable in component[1]:
+            componentOf[variable] = merged
+          components.remove(component)
+      merged[0].append(constraint)
+      merged[1].update(constraint[2])
+      for variable in constraint[2]:
+        componentOf[variable] = merged
+    return [(component[0], list(component[1])) for component in components]
+
+  def __globalSolver(self):
+    wasUsed = False
+    constraintsList = self.__getAllConstraints()
+    # Unrelated frontier regions are solved on their own so that their
+    # solution counts do not multiply each other
+    for componentConstraints, uniqueVariables in self.__splitComponents(constraintsList):
+      try:
+        totals, cellTotals, forcedTiles = self.__countComponentSolutions(componentConstraints)
+      except CountingTimeout:
+        break
+      for variable, value in forcedTiles.items():
+        if self.__applyDeduction(variable, value):
+          wasUsed = True
+    return wasUsed
+
+  def __reduceRowEchelon(self, matrix):
+    #Reduces an augmented constraint matrix (a list of integer rows) to reduced row echelon form in place
+    # Rows are only combined with integer multiples of each other and divided
+    # by the gcd of their entries, so there is no rounding to go wrong
+    numCols = len(matrix[0]) if matrix else 0
+    pivotRow = 0
+    for col in range(numCols - 1):
+      if pivotRow == len(matrix):
+        break
+      bestRow = next((row for row in range(pivotRow, len(matrix)) if matrix[row][col] != 0), None)
+      if bestRow is None:
+        continue
+      matrix[pivotRow], matrix[bestRow] = matrix[bestRow], matrix[pivotRow]
+      pivot = matrix[pivotRow]
+      pivotValue = pivot[col]
+      for row in range(len(matrix)):
+        factor = matrix[row][col]
+        if row == pivotRow or factor == 0:
+          continue
+        combined = [pivotValue * entry - factor * pivotEntry for entry, pivotEntry in zip(matrix[row], pivot)]
+        divisor = reduce(gcd, combined, 0)
+        matrix[row] = [entry // divisor for entry in combined] if divisor > 1 else combined
+      pivotRow += 1
+    return matrix
+
+  def __linearSolver(self):
+    wasUsed = False
+    constraintsList = self.__getAllConstraints()
+    for componentConstraints, uniqueVariables in self.__splitComponents(constraintsList):
+      if self.__outOfTime():
+        break
+      # Rows are numbered tiles, columns are their unknown neighbours and the
+      # last column holds the number of mines still to be placed
+      column = dict((variable, position) for position, variable in enumerate(uniqueVariables))
+      matrix = []
+      for constraint in componentConstraints:
+        row = [0] * (len(uniqueVariables) + 1)
+        for variable in constraint[2]:
+          row[column[variable]] = 1
+        row[-1] = constraint[1]
+        matrix.append(row)
+      self.__reduceRowEchelon(matrix)
+      # Every variable is 0 or 1, so a reduced row whose value equals the sum
+      # of its positive (or negative) coefficients forces all of its variables
+      for row in matrix:
+        positive = [position for position, coefficient in enumerate(row[:-1]) if coefficient > 0]
+        negative = [position for position, coefficient in enumerate(row[:-1]) if coefficient < 0]
+        if not positive and not negative:
+          continue
+        if row[-1] == sum(row[position] for position in positive):
+          positiveValue = 1
+        elif row[-1] == sum(row[position] for position in negative):
+          positiveValue = 0
+        else:
+          continue
+        for position in positive:
+          if self.__applyDeduction(uniqueVariables[position], positiveValue):
+            wasUsed = True
+        for position in negative:
+          if self.__applyDeduction(uniqueVariables[position], 1 - positiveValue):
             wasUsed = True
     return wasUsed
 
+  def __getComponentShape(self, componentConstraints):
+    #Returns a translation independent key for a component and the offset it was taken at
+    # Tiles are written relative to the top-left corner of the component's
+    # bounding box, so the same pattern anywhere on any board shares a key
+    coordinates = dict((variable, divmod(variable, self.yDimension)) for constraint in componentConstraints for variable in constraint[2])
+    offsetX = min(x for x, y in coordinates.values())
+    offsetY = min(y for x, y in coordinates.values())
+    shape = tuple(sorted((constraint[1], tuple(sorted((coordinates[variable][0] - offsetX, coordinates[variable][1] - offsetY) for variable in constraint[2]))) for constraint in componentConstraints))
+    return shape, offsetX, offsetY
+
+  def __countComponentSolutions(self, componentConstraints):
+    #Counts the solutions of a component, grouped by the number of mines they place
+    # Returns (totals, cellTotals, forcedTiles) where forcedTiles maps the tiles
+    # that are safe (0) or a mine (1) in every solution to that value
+    shape, offsetX, offsetY = self.__getComponentShape(componentConstraints)
+    solved = self.componentCache.get(shape)
+    if solved is None:
+      # Solve the shape itself so the result can be reused at any offset
+      shapeConstraints = [(None, value, scope) for value, scope in shape]
+      totals, relativeTotals = countSolutions(shapeConstraints, self.deadline)
+      numSolutions = sum(totals.values())
+      relativeForced = {}
+      if numSolutions != 0:
+        for relative, mineTotals in relativeTotals.items():
+          numMineSolutions = sum(mineTotals.values())
+          if numMineSolutions == 0:
+            relativeForced[relative] = 0
+          elif numMineSolutions == numSolutions:
+            relativeForced[relative] = 1
+      solved = (totals, relativeTotals, relativeForced)
+      self.componentCache.put(shape, solved)
+    totals, relativeTotals, relativeForced = solved
+    self.__countStat('solutions', sum(totals.values()))
+    toIndex = lambda relative: (relative[0] + offsetX) * self.yDimension + relative[1] + offsetY
+    cellTotals = dict((toIndex(relative), mineTotals) for relative, mineTotals in relativeTotals.items())
+    forcedTiles = dict((toIndex(relative), value) for relative, value in relativeForced.items())
+    return totals, cellTotals, forcedTiles
+
+  def getCacheStats(self):
+    #Returns the hit, miss and eviction statistics of the component cache
+    return self.componentCache.getStats()
+
+  def getGroupCacheStats(self):
+    #Returns the hit, miss and eviction statistics of the pair and triple deduction cache
+    return self.groupCache.getStats()
+
+  def __convolveTotals(self, totalsList):
+    #Combines per-component mine count distributions into one distribution
+    combined = {0: 1}
+    for totals in totalsList:
+      nextCombined = {}
+      for numMines, count in combined.items():
+        for componentMines, componentCount in totals.items():
+          key = numMines + componentMines
+          nextCombined[key] = nextCombined.get(key, 0) + count * componentCount
+      combined = nextCombined
+    return combined
+
+  def getMineProbabilities(self):
+    #Returns a dictionary mapping every unknown tile to its probability of holding a mine
+    # In sparse mode only the frontier tiles are listed; every other unknown
+    # tile has the same probability, which getInteriorProbability() returns
+    if self.AIBoard == None:
+      return {}
+    probabilities, interiorProbability, interiorCount, frontierTiles = self.__getProbabilities()
+    if interiorCount != 0 and not self.sparse:
+      for x, row in enumerate(self.AIBoard):
+        for y, value in enumerate(row):
+          if value == 'X' and x * self.yDimension + y not in frontierTiles:
+            probabilities[(x, y)] = interiorProbability
+    return probabilities
+
+  def getInteriorProbability(self):
+    #Returns the probability that an unknown tile away from the frontier holds a mine (None if there is none)
+    if self.AIBoard == None:
+      return None
+    probabilities, interiorProbability, interiorCount, frontierTiles = self.__getProbabilities()
+    return interiorProbability if interiorCount != 0 else None
+
+  def __getProbabilities(self):
+    #Returns the mine probabilities of the frontier tiles, the probability shared by
+    #every interior tile, the number of interior tiles and the frontier tile indices
+    minesRemaining = self.numberMines - self.markedMines
+
+    # Count the solutions of every independent frontier component
+    components = []
+    frontierTiles = set()
+    for componentConstraints, uniqueVariables in self.__splitComponents(self.__getAllConstraints(False)):
+      totals, cellTotals, _ = self.__countComponentSolutions(componentConstraints)
+      if len(totals) == 0:
+        continue
+      components.append((totals, cellTotals))
+      frontierTiles.update(uniqueVariables)
+    interiorCount = self.unknownTiles - len(frontierTiles)
+
+    # Each frontier configuration placing k mines can be completed in
+    # comb(interior, remaining - k) ways across the unconstrained interior
+    combined = self.__convolveTotals([totals for totals, _ in components])
+    interiorWeights = self.__getInteriorWeights(interiorCount, minesRemaining, max(combined) if len(combined) != 0 else 0)
+    interiorWeight = lambda numMines: interiorWeights.get(numMines, 0)
+    totalWeight = sum(count * interiorWeight(numMines) for numMines, count in combined.items())
+    if totalWeight == 0:
+      # The global mine count is inconsistent with the frontier, so fall
+      # back to treating every frontier configuration as equally likely
+      interiorWeight = lambda numMines: 1
+      totalWeight = sum(combined.values())
+
+    probabilities = {}
+    for index, (totals, cellTotals) in enumerate(components):
+      otherTotals = self.__convolveTotals([other[0] for otherIndex, other in enumerate(components) if otherIndex != index])
+      componentWeight = {}
+      for numMines in totals:
+        componentWeight[numMines] = sum(count * interiorWeight(numMines + otherMines) for otherMines, count in otherTotals.items())
+      for variable, mineTotals in cellTotals.items():
+        mineWeight = sum(count * componentWeight[numMines] for numMines, count in mineTotals.items())
+        probabilities[divmod(variable, self.yDimension)] = mineWeight / totalWeight
+    interiorProbability = None
+    if interiorCount != 0:
+      interiorMines = sum(count * interiorWeight(numMines) * (minesRemaining - numMines) for numMines, count in combined.items())
+      interiorProbability = min(max(interiorMines / (totalWeight * interiorCount), 0.0), 1.0)
+    return probabilities, interiorProbability, interiorCount, frontierTiles
+
+  def __getInteriorWeights(self, interiorCount, minesRemaining, maxFrontierMines):
+    #Returns, for every possible number k of frontier mines, a weight proportional to comb(interiorCount, minesRemaining - k)
+    # Only the ratios between the weights matter, so rather than computing the
+    # binomials themselves (huge numbers on large boards) they are scaled by a
+    # common factor, leaving products of at most maxFrontierMines small terms:
+    # comb(n, r + 1) / comb(n, r) = (n - r) / (r + 1)
+    lowestInteriorMines = max(minesRemaining - maxFrontierMines, 0)
+    highestInteriorMines = min(minesRemaining, interiorCount)
+    if lowestInteriorMines > highestInteriorMines:
+      return {}
+    weights = {}
+    rising = 1
+    for interiorMines in range(lowestInteriorMines, highestInteriorMines + 1):
+      weights[interiorMines] = rising
+      rising *= interiorCount - interiorMines
+    falling = 1
+    for interiorMines in range(highestInteriorMines, lowestInteriorMines - 1, -1):
+      weights[interiorMines] *= falling
+      falling *= interiorMines
+    return dict((minesRemaining - interiorMines, weight) for interiorMines, weight in weights.items())
+
+  def __hasQueuedMove(self):
+    #Drops queued moves that are no longer unknown and reports whether any move is left
+    while len(self.moveQueue) != 0:
+      nextMove = self.moveQueue[-1]
+      if self.AIBoard[nextMove[0]][nextMove[1]] == 'X':
+        return True
+      self.moveQueue.pop()
+    return False
+
+  def __fillMoveQueue(self):
+    #Runs the pipeline stages, cheapest first, until at least one move is queued
+    # A stage that only marks mines restarts the pipeline from the cheapest
+    # stage, since the new mines may let it find safe tiles. Once the time
+    # budget is used up only the stages that run regardless (the guess) run
+    self.stageReports = []
+    while not self.__hasQueuedMove():
+      self.queuedTiles.clear()
+      for stage in self.pipeline:
+        if self.__outOfTime() and not stage.runsWhenOutOfTime:
+          if self.timedOutTier is None:
+            self.timedOutTier = stage.name
+          self.stageReports.append({'stage': stage.name, 'ran': False, 'success': False, 'found': 0,
+                                    'safe': [], 'mines': [], 'guesses': [], 'time': 0.0})
+          continue
+        stageResults = self.__runStage(stage)
+        if self.__outOfTime() and self.timedOutTier is None and not stage.runsWhenOutOfTime:
+          self.timedOutTier = stage.name
+        if stageResults:
+          self.lastTier = stage.name
+          break
+      else:
+        return False
+    return True
+
+  def __runStage(self, stage):
+    #Runs a pipeline stage, reporting it and recording its statistics when instrumentation is on
+    self.tierCounts = {'constraints': 0, 'solutions': 0, 'deductions': 0}
+    self.foundTiles = {'safe': [], 'mines': [], 'guesses': []}
+    startTime = perf_counter()
+    stageResults = stage.run(self)
+    elapsed = perf_counter() - startTime
+    foundTiles = self.foundTiles
+    found = len(foundTiles['safe']) + len(foundTiles['mines']) + len(foundTiles['guesses'])
+    self.stageReports.append({'stage': stage.name, 'ran': True, 'success': bool(stageResults), 'found': found,
+                              'safe': foundTiles['safe'], 'mines': foundTiles['mines'], 'guesses': foundTiles['guesses'], 'time': elapsed})
+    if self.stats is not None:
+      self.stats.record(stage.name, elapsed, stageResults, **self.tierCounts)
+    return stageResults
+
+  def runBuiltinTier(self, tierName):
+    #Runs one of the built-in solver tiers; returns whether it queued a move or marked a mine
+    return self.builtinTiers[tierName]()
+
+  def __guessSolver(self):
+    #Queues the safest guess when no tier could prove a move
+    if not self.__chooseGuessMove():
+      return False
+    self.__log('there is no certain moves, choosing the lowest risk tile')
+    return True
+
+  def getStageReports(self):
+    #Returns, for every stage tried during the last move, whether it ran, whether it succeeded, what it found and how long it took
+    # The tiles are given as (x, y) coordinates, in the order they were found
+    return [dict(report, safe=list(report['safe']), mines=list(report['mines']), guesses=list(report['guesses']))
+            for report in self.stageReports]
+
+  def getStats(self):
+    #Returns the per-tier statistics as a dictionary (empty when instrumentation is off)
+    return self.stats.getStats() if self.stats is not None else {}
+
+  def dumpStats(self, destination):
+    #Writes the per-tier statistics as JSON to a file path or an open file
+    (self.stats if self.stats is not None else SolverStats()).dump(destination)
+
+  def __solveMove(self):
+    #Fills the move queue for a new move within the time budget
+    self.timedOutTier = None
+    self.deadline = (monotonic() + self.timeBudget) if self.timeBudget is not None else None
+    try:
+      return self.__fillMoveQueue()
+    finally:
+      self.deadline = None
+
   def makeMove(self):
-    """
-    """
-    if len(self.moveQueue) != 0:
-      nextMove = self.moveQueue.pop()
-      if self.AIBoard[nextMove[0]][nextMove[1]] != 'X':
-        return self.makeMove()
+    #Returns the next tile to uncover, or None once no unknown tile is left
+    if not self.__solveMove():
+      return None
+    nextMove = self.moveQueue.pop()
+    if self.recorder is not None:
+      self.recorder.recordSolve(self.lastTier, [nextMove])
+    if self.verbose:
       self.print()
-      return nextMove[0], nextMove[1]
-    else:
-      firstResults = self.__firstDegreeSolver()
-      if firstResults:
-        return self.makeMove()
-      secondResults = self.__secondDegreeSolver()
-      if secondResults:
-        return self.makeMove()
-      thirdResults = self.__thirdDegreeSolver()
-      if thirdResults:
-        return self.makeMove()
-      globalResults = self.__globalSolver()
-      if globalResults:
-        return self.makeMove()
-      randomResults = self.__chooseRandomMove()
-      if randomResults:
-        print('there is no certain moves, choosing randomly')
-        return self.makeMove()
-
-  
\ No newline at end of file
+    return nextMove[0], nextMove[1]
+
+  def makeMoves(self):
+    #Returns every tile currently proven to be safe, or a single guess if there are none
+    # (an empty list once no unknown tile is left)
+    if not self.__solveMove():
+      return []
+    moves = []
+    seenMoves = set()
+    for nextMove in self.moveQueue:
+      if nextMove not in seenMoves and self.AIBoard[nextMove[0]][nextMove[1]] == 'X':
+        seenMoves.add(nextMove)
+        moves.append(nextMove)
+    self.moveQueue = []
+    if self.recorder is not None:
+      self.recorder.recordSolve(self.lastTier, moves)
+    if self.verbose:
+      self.print()
+    return moves
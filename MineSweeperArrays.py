@@ -0,0 +1,49 @@
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+# Array-backed boards store every tile as a small integer:
+# - game state boards use -9 for a mine and 0-8 for the number of adjacent mines
+# - AI view boards use the codes below for symbols and 1-8 for numbers
+MINE = -9
+UNKNOWN = -1
+REVEALED_MINE = -2
+MARKED_MINE = -3
+EMPTY = 0
+SYMBOL_CODES = {'X': UNKNOWN, 'x': REVEALED_MINE, '*': MARKED_MINE, '-': EMPTY}
+CODE_SYMBOLS = dict((code, symbol) for symbol, code in SYMBOL_CODES.items())
+
+def requireNumpy():
+  #Raises an ImportError if NumPy, which array-backed boards need, is not installed
+  if np is None:
+    raise ImportError('array-backed boards require numpy')
+
+def decodeSymbol(code):
+  #Returns the list-of-lists symbol for a tile code
+  code = int(code)
+  return CODE_SYMBOLS.get(code, code)
+
+def encodeSymbol(symbol):
+  #Returns the tile code for a list-of-lists symbol
+  return SYMBOL_CODES.get(symbol, symbol)
+
+def decodeBoard(array):
+  #Returns the list-of-lists view of an array-backed AI view board
+  return [[decodeSymbol(code) for code in row] for row in array.tolist()]
+
+def encodeBoard(board):
+  #Returns the array-backed form of a list-of-lists AI view board
+  return np.array([[encodeSymbol(symbol) for symbol in row] for row in board], dtype=np.int8)
+
+def neighbourhoodSum(mask):
+  #Counts, for every tile, how many of its eight neighbours are set in the mask
+  # The last two axes are the board; any leading axes index a batch of boards
+  rows, cols = mask.shape[-2:]
+  padded = np.pad(mask.astype(np.int8), [(0, 0)] * (mask.ndim - 2) + [(1, 1), (1, 1)])
+  total = np.zeros(mask.shape, dtype=np.int8)
+  for offsetX in range(3):
+    for offsetY in range(3):
+      if offsetX != 1 or offsetY != 1:
+        total += padded[..., offsetX:offsetX + rows, offsetY:offsetY + cols]
+  return total
@@ -0,0 +1,160 @@
+import argparse
+import json
+import math
+import random
+from time import perf_counter
+
+from MineSweeper import (
+  CONST_GAMEBOARD_ROWS_BEGINNER, CONST_GAMEBOARD_COLS_BEGINNER, CONST_GAMEBOARD_MINES_BEGINNER,
+  CONST_GAMEBOARD_ROWS_INTERMEDIATE, CONST_GAMEBOARD_COLS_INTERMEDIATE, CONST_GAMEBOARD_MINES_INTERMEDIATE,
+  CONST_GAMEBOARD_ROWS_EXPERT, CONST_GAMEBOARD_COLS_EXPERT, CONST_GAMEBOARD_MINES_EXPERT,
+)
+from MineSweeperAI import MineSweeperAI
+from MineSweeperBoard import MineSweeperBoard
+from MineSweeperReplay import GameRecorder
+
+DIFFICULTIES = {
+  'beginner': (CONST_GAMEBOARD_ROWS_BEGINNER, CONST_GAMEBOARD_COLS_BEGINNER, CONST_GAMEBOARD_MINES_BEGINNER),
+  'intermediate': (CONST_GAMEBOARD_ROWS_INTERMEDIATE, CONST_GAMEBOARD_COLS_INTERMEDIATE, CONST_GAMEBOARD_MINES_INTERMEDIATE),
+  'expert': (CONST_GAMEBOARD_ROWS_EXPERT, CONST_GAMEBOARD_COLS_EXPERT, CONST_GAMEBOARD_MINES_EXPERT),
+}
+
+def playGame(rows, cols, mines, seed, timeBudget=None, recorder=None):
+  #Plays one game without any console output and returns its results
+  # Every AI solve (one batch of moves) is timed as one move latency. The board
+  # and AI share one generator seeded with the seed, so it fixes both the
+  # layout and the AI's guesses without the two drawing the same numbers
+  startTime = perf_counter()
+  generator = random.Random(seed)
+  gameboard = MineSweeperBoard(rows, cols, mines, verbose=False, rng=generator, recorder=recorder)
+  AI = MineSweeperAI(rows, cols, mines, timeBudget=timeBudget, verbose=False, rng=generator, recorder=recorder)
+  moves = 0
+  guesses = 0
+  latencies = []
+  while not gameboard.isGameOver():
+    AI.updateAIViewBoard(gameboard.getAIBoard(), gameboard.getChangedTiles())
+    moveStart = perf_counter()
+    batch = AI.makeMoves()
+    latencies.append(perf_counter() - moveStart)
+    if AI.lastTier == 'guess':
+      guesses += 1
+    moves += len(gameboard.makeMoves(batch))
+  totalTime = perf_counter() - startTime
+  return {
+    'seed': seed,
+    'won': gameboard.movesRemaining == 0,
+    'moves': moves,
+    'guesses': guesses,
+    'time': totalTime,
+    'latencies': latencies,
+  }
+
+def percentile(sortedValues, fraction):
+  #Returns the nearest-rank percentile of an already sorted list
+  if len(sortedValues) == 0:
+    return 0.0
+  rank = max(int(math.ceil(fraction * len(sortedValues))) - 1, 0)
+  return sortedValues[min(rank, len(sortedValues) - 1)]
+
+class BenchmarkSummary:
+
+  def __init__(self):
+    #Initializes an empty summary of played games
+    self.games = 0
+    self.wins = 0
+    self.moves = 0
+    self.guesses = 0
+    self.totalTime = 0.0
+    self.latencies = []
+
+  def add(self, result):
+    #Adds the results of one game to the summary
+    self.games += 1
+    self.wins += 1 if result['won'] else 0
+    self.moves += result['moves']
+    self.guesses += result['guesses']
+    self.totalTime += result['time']
+    self.latencies.extend(result['latencies'])
+
+  def getSummary(self):
+    #Returns the aggregated results as a dictionary, with latencies in milliseconds
+    latencies = sorted(self.latencies)
+    games = max(self.games, 1)
+    return {
+      'games': self.games,
+      'wins': self.wins,
+      'winRate': float(self.wins) / games,
+      'movesPerGame': float(self.moves) / games,
+      'guessesPerGame': float(self.guesses) / games,
+      'totalTime': self.totalTime,
+      'latencyP50': percentile(latencies, 0.50) * 1000,
+      'latencyP95': percentile(latencies, 0.95) * 1000,
+      'latencyP99': percentile(latencies, 0.99) * 1000,
+    }
+
+def formatSummary(summary):
+  #Formats a summary dictionary as a two column table
+  rows = [
+    ('games', '{}'.format(summary['games'])),
+    ('win rate', '{:.2%}'.format(summary['winRate'])),
+    ('moves / game', '{:.2f}'.format(summary['movesPerGame'])),
+    ('guesses / game', '{:.2f}'.format(summary['guessesPerGame'])),
+    ('total time (s)', '{:.3f}'.format(summary['totalTime'])),
+    ('p50 move (ms)', '{:.3f}'.format(summary['latencyP50'])),
+    ('p95 move (ms)', '{:.3f}'.format(summary['latencyP95'])),
+    ('p99 move (ms)', '{:.3f}'.format(summary['latencyP99'])),
+  ]
+  # The farm plays games in parallel, so its summed game time is shown apart
+  # from the time the run took
+  if 'gameTime' in summary:
+    rows.insert(5, ('game time (s)', '{:.3f}'.format(summary['gameTime'])))
+  width = max(len(name) for name, value in rows)
+  return '\n'.join('{}  {}'.format(name.ljust(width), value) for name, value in rows)
+
+def runBenchmark(rows, cols, mines, games, seed=0, timeBudget=None, recorder=None):
+  #Plays a number of games with consecutive seeds and returns their summary
+  # Given a GameRecorder, every game is also appended to its event log
+  summary = BenchmarkSummary()
+  for gameNumber in range(games):
+    summary.add(playGame(rows, cols, mines, seed + gameNumber, timeBudget, recorder))
+  return summary.getSummary()
+
+def parseBoardArguments(parser):
+  #Adds the board selection arguments shared by the headless runners
+  parser.add_argument('--difficulty', choices=sorted(DIFFICULTIES), default='beginner',
+                      help='standard board to play (default: beginner)')
+  parser.add_argument('--rows', type=int, help='custom number of rows')
+  parser.add_argument('--cols', type=int, help='custom number of columns')
+  parser.add_argument('--mines', type=int, help='custom number of mines')
+  parser.add_argument('--games', type=int, default=100, help='number of games to play (default: 100)')
+  parser.add_argument('--seed', type=int, default=0, help='seed of the first game (default: 0)')
+  parser.add_argument('--time-budget', type=float, help='per-move time budget of the AI in seconds')
+  parser.add_argument('--output', help='write the summary as JSON to this file')
+
+def getBoardShape(arguments):
+  #Returns the (rows, cols, mines) selected by the parsed arguments
+  rows, cols, mines = DIFFICULTIES[arguments.difficulty]
+  custom = (arguments.rows, arguments.cols, arguments.mines)
+  if any(value is not None for value in custom):
+    if any(value is None for value in custom):
+      raise ValueError('--rows, --cols and --mines must be given together')
+    rows, cols, mines = custom
+  return rows, cols, mines
+
+# Headless benchmark entry point
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description='Plays MineSweeper games without interaction and reports solver performance.')
+  parseBoardArguments(parser)
+  parser.add_argument('--log', help='append an event log of every game to this file (see MineSweeperReplay)')
+  arguments = parser.parse_args()
+  rows, cols, mines = getBoardShape(arguments)
+  recorder = GameRecorder(arguments.log) if arguments.log else None
+  summary = runBenchmark(rows, cols, mines, arguments.games, arguments.seed, arguments.time_budget, recorder)
+  if recorder is not None:
+    recorder.close()
+  summary.update({'rows': rows, 'cols': cols, 'mines': mines, 'seed': arguments.seed})
+  print('{}x{} board, {} mines'.format(rows, cols, mines))
+  print(formatSummary(summary))
+  if arguments.output:
+    with open(arguments.output, 'w') as outputFile:
+      json.dump(summary, outputFile, indent=2, sort_keys=True)
@@ -1,14 +1,27 @@
-import random
+from collections import deque
+from random import Random
+from MineSweeperArrays import np, requireNumpy, decodeBoard, encodeBoard, neighbourhoodSum, MINE, UNKNOWN, REVEALED_MINE
+from MineSweeperNeighbours import getNeighbourTable
+from MineSweeperSparse import SparseBoard
 
 class MineSweeperBoard:
 
-  def __init__(self, xDimension, yDimension, numberMines):
+  def __init__(self, xDimension, yDimension, numberMines, useArrays=False, verbose=True, seed=None, rng=None, gameStateBoard=None, sparse=False, recorder=None):
 
 
     self.xDimension = xDimension
     self.yDimension = yDimension
     self.numberMines = numberMines
 
+    # When verbose is off the board does not print the win/loss banners
+    self.verbose = verbose
+
+    # Random number generator used to place the mines; pass a seed or a
+    # random.Random instance to get the same layout every time (it is only
+    # created when the board seeds its own mines)
+    self.seed = seed
+    self.random = rng
+
     # Store the coordinates of mines when they are created so
     self.mineCoordinates = []
     self.gameOver = False
@@ -25,19 +38,64 @@ class MineSweeperBoard:
     # -  -1 = Empty tile (only used when the board is first initialized)
     # -  -9 = Mine location
     # - 0-9 = Number of adjacent mines to a tile 
-    self.gameStateBoard = [[-1 for x in range(self.yDimension)] for y in range(self.xDimension)]
-    
+    #
     # AI gameboard view consists of the following symbols
     # -   X = Unknown (not yet selected) tile
     # -   x = Mine location
     # -   - = 0 value (no adjacent mines)
     # - 1-9 = Number of adjacent mines
-    self.AIViewBoard = [['X' for x in range(self.yDimension)] for y in range(self.xDimension)]
+    #
+    # In array-backed mode both boards are small-int NumPy arrays, with the
+    # AI view symbols encoded as described in MineSweeperArrays.
+    #
+    # In sparse mode (for very large boards) there is no game state board:
+    # only the tile indices (x * yDimension + y) of the mines are stored and a
+    # tile's value is counted when it is revealed. The AI view board only
+    # stores revealed tiles
+    self.useArrays = useArrays
+    self.sparse = sparse
+    if self.sparse and self.useArrays:
+      raise ValueError('sparse boards cannot be array-backed')
+    if self.sparse:
+      self.gameStateBoard = None
+      self.mineIndices = set()
+      self.AIViewBoard = SparseBoard(self.xDimension, self.yDimension, 'X')
+      self.unknownSymbol = 'X'
+    elif self.useArrays:
+      requireNumpy()
+      self.gameStateBoard = np.full((self.xDimension, self.yDimension), -1, dtype=np.int8)
+      self.AIViewBoard = np.full((self.xDimension, self.yDimension), UNKNOWN, dtype=np.int8)
+      self.unknownSymbol = UNKNOWN
+    else:
+      self.gameStateBoard = [[-1 for x in range(self.yDimension)] for y in range(self.xDimension)]
+      self.AIViewBoard = [['X' for x in range(self.yDimension)] for y in range(self.xDimension)]
+      self.unknownSymbol = 'X'
+
+    # Neighbour table shared by every board of the same shape (computed on
+    # demand for sparse and large boards)
+    self.neighbourCoordinates = getNeighbourTable(self.xDimension, self.yDimension, lazy=self.sparse)
+    if self.sparse:
+      self.neighbourIndices = getNeighbourTable(self.xDimension, self.yDimension, asIndices=True, lazy=True)
+
+    # Coordinates of the tiles revealed since the last call to getChangedTiles()
+    self.changedTiles = []
+
+    # Optional event log (see MineSweeperReplay) that the layout and every
+    # move are appended to
+    self.recorder = recorder
 
     # Seed the board with mines and then determine the correct values
-    # to assign for the remaining nodes based on adjacency to mines
-    self.__seedMines()
-    self.__seedValues()
+    # to assign for the remaining nodes based on adjacency to mines, unless
+    # a finished game state board was given (see MineSweeperGenerator)
+    if gameStateBoard is not None:
+      self.__loadGameState(gameStateBoard)
+    else:
+      if self.random is None:
+        self.random = Random(seed)
+      self.__seedMines()
+      self.__seedValues()
+    if self.recorder is not None:
+      self.recorder.recordStart(self)
 
   def isGameOver(self):
     #Returns whether the game has been marked as over
@@ -45,43 +103,90 @@ class MineSweeperBoard:
 
   def __seedMines(self):
     #Seeds mines into an empty gameStateBoard
-    minesRemaining = self.numberMines
-    while minesRemaining > 0:
-      x = random.randint(0, self.xDimension - 1)
-      y = random.randint(0, self.yDimension - 1)
-      if self.gameStateBoard[x][y] == -9:
-        continue
-      self.gameStateBoard[x][y] = -9
+    # All mine positions are drawn at once, without retrying occupied tiles
+    for index in self.random.sample(range(self.xDimension * self.yDimension), self.numberMines):
+      x, y = divmod(index, self.yDimension)
+      if self.sparse:
+        self.mineIndices.add(index)
+      else:
+        self.gameStateBoard[x][y] = -9
       self.mineCoordinates.append((x, y))
-      minesRemaining -= 1
 
   def __seedValues(self):
     #Seeds values into tiles not containing mines in the gameStateBoard
-    for x, row in enumerate(self.gameStateBoard):
+    # Sparse boards count values when tiles are revealed instead
+    if self.sparse:
+      return
+    if self.useArrays:
+      # Count every tile's adjacent mines in one pass over the whole board
+      mines = self.gameStateBoard == MINE
+      self.gameStateBoard = np.where(mines, MINE, neighbourhoodSum(mines)).astype(np.int8)
+      return
+    # Start every tile without a mine at zero, then add one to the
+    # neighbours of each mine
+    for row in self.gameStateBoard:
       for y, value in enumerate(row):
-        # If the tile contains a mine, we are not interested in it
-        # so go onto the next tile
-        if value == -9:
-          continue
-        # Otherwise, calculate the number of adjacent mines, so that
-        # value can then be assigned to the tile
-        tileValue = self.__getNumAdjMines(x, y)
-        self.gameStateBoard[x][y] = tileValue
+        if value != -9:
+          row[y] = 0
+    for x, y in self.mineCoordinates:
+      for adjX, adjY in self.neighbourCoordinates[x * self.yDimension + y]:
+        if self.gameStateBoard[adjX][adjY] != -9:
+          self.gameStateBoard[adjX][adjY] += 1
+
+  def __loadGameState(self, gameStateBoard):
+    #Uses an already generated game state board (list of lists or array) instead of seeding one
+    if np is not None and (self.useArrays or isinstance(gameStateBoard, np.ndarray)):
+      gameStateArray = np.asarray(gameStateBoard, dtype=np.int8)
+      shape = gameStateArray.shape
+      self.mineCoordinates = [(x, y) for x, y in np.argwhere(gameStateArray == MINE).tolist()]
+      self.gameStateBoard = gameStateArray.copy() if self.useArrays else gameStateArray.tolist()
+    else:
+      self.gameStateBoard = [list(row) for row in gameStateBoard]
+      shape = (len(self.gameStateBoard), min(len(row) for row in self.gameStateBoard))
+      self.mineCoordinates = [(x, y) for x, row in enumerate(self.gameStateBoard) for y, value in enumerate(row) if value == -9]
+    if shape != (self.xDimension, self.yDimension):
+      raise ValueError('game state board does not match the board dimensions')
+    if len(self.mineCoordinates) != self.numberMines:
+      raise ValueError('game state board does not contain the given number of mines')
+    if self.sparse:
+      self.gameStateBoard = None
+      self.mineIndices = set(x * self.yDimension + y for x, y in self.mineCoordinates)
+
+  def __log(self, message):
+    #Prints a message when the board is verbose
+    if self.verbose:
+      print(message)
 
   def print(self, gameboard=None):
     #Print the AI gameboard
-    board = self.AIViewBoard if (gameboard == None) else gameboard
+    board = self.getAIBoard() if (gameboard is None) else gameboard
     print('\n')
     print('\n'.join([' '.join([str(cell) for cell in row]) for row in board]))
     print('\n')
 
   def printDebug(self):
     #Prints the game state board
-    self.print(self.gameStateBoard)
+    if self.sparse:
+      self.print([[self.__getValue(x, y) for y in range(self.yDimension)] for x in range(self.xDimension)])
+    else:
+      self.print(self.gameStateBoard)
 
-  def __hasMine(self, x, y):
-    #Determines if a mine is present at the given location
-    return True if self.gameStateBoard[x][y] == -9 else False
+  def __getValue(self, x, y):
+    #Returns the game state value of the tile at (x, y)
+    if self.sparse:
+      # Count the mines around the tile from the stored mine indices
+      mineIndices = self.mineIndices
+      index = x * self.yDimension + y
+      if index in mineIndices:
+        return -9
+      value = 0
+      for adjIndex in self.neighbourIndices[index]:
+        if adjIndex in mineIndices:
+          value += 1
+      return value
+    if self.useArrays:
+      return self.gameStateBoard[x, y]
+    return self.gameStateBoard[x][y]
 
   def __revealMines(self):
     #Reveals all the mines on the AI visible gameboard
@@ -98,140 +203,128 @@ class MineSweeperBoard:
       return False
     return True
   
-  def __getNumAdjMines(self, x, y):
-    #This is a helper function used by the __seedValues() function to determine the number of mines adjacent to any given tile on the game state board.
-    totalNumMines = 0
-    ## Check the tile to the west
-    if (self.__coordinateCheck(x, y-1)):
-      if self.__hasMine(x, y-1):
-        totalNumMines += 1
-    ## Check the tile to the north-west
-    if (self.__coordinateCheck(x-1, y-1)):
-      if self.__hasMine(x-1, y-1):
-        totalNumMines += 1
-    ## Check the tile to the north
-    if (self.__coordinateCheck(x-1, y)):
-      if self.__hasMine(x-1, y):
-        totalNumMines += 1
-    ## Check the tile to the north-east
-    if (self.__coordinateCheck(x-1, y+1)):
-      if self.__hasMine(x-1, y+1):
-        totalNumMines += 1
-    ## Check the tile to the east
-    if (self.__coordinateCheck(x, y+1)):
-      if self.__hasMine(x, y+1):
-        totalNumMines += 1
-    ## Check the tile to the south-east
-    if (self.__coordinateCheck(x+1, y+1)):
-      if self.__hasMine(x+1, y+1):
-        totalNumMines += 1
-    ## Check the tile to the south
-    if (self.__coordinateCheck(x+1, y)):
-      if self.__hasMine(x+1, y):
-        totalNumMines += 1
-    ## Check the tile to the south-west
-    if (self.__coordinateCheck(x+1, y-1)):
-      if self.__hasMine(x+1, y-1):
-        totalNumMines += 1
-    ## Return the total number of adjacent mines found
-    return totalNumMines
-
   def __revealTile(self, x, y):
     #This is a helper function that reveals the tile found at coordinates (x, y) in the AIViewBoard.
+    # Returns the tile's value on the game state board
+    self.changedTiles.append((x, y))
     # If the gameStateBoard contains a mine at the input coordinates,
     # show a mine on the AIViewBoard
-    if self.gameStateBoard[x][y] == -9:
+    if self.useArrays:
+      # Numbers and zero tiles share their codes with the game state board
+      value = self.gameStateBoard[x, y]
+      if value == MINE:
+        self.AIViewBoard[x, y] = REVEALED_MINE
+      else:
+        self.AIViewBoard[x, y] = value
+        self.movesRemaining -= 1
+      return value
+    value = self.__getValue(x, y)
+    if value == -9:
       self.AIViewBoard[x][y] = 'x'
-    elif self.gameStateBoard[x][y] == 0:
+    elif value == 0:
       self.AIViewBoard[x][y] = '-'
       self.movesRemaining -= 1
     else:
-      self.AIViewBoard[x][y] = self.gameStateBoard[x][y]
+      self.AIViewBoard[x][y] = value
       self.movesRemaining -= 1
+    return value
 
   def __hasBeenPlayed(self, x, y):
     #Check the AIViewBoard to see if a tile has already been played
-    return False if self.AIViewBoard[x][y] == 'X' else True
+    # A sparse AI view board only stores the tiles that have been played
+    if self.sparse:
+      return (x, y) in self.AIViewBoard.tiles
+    return False if self.AIViewBoard[x][y] == self.unknownSymbol else True
 
   def __uncoverAdjTiles(self, x, y):
     #This function is used when the AI selects a '0' tile on the game state board.
-    # Ensure that the input coordinates belong to a tile containing a
-    # zero value (i.e. no adjacent mines)
-    if self.gameStateBoard[x][y] == 0:
-      ## Check the tile to the west
-      if (self.__coordinateCheck(x, y-1)):
-        if not self.__hasBeenPlayed(x, y-1):
-          self.__revealTile(x, y-1)
-          self.__uncoverAdjTiles(x, y-1)
-      ## Check the tile to the north-west
-      if (self.__coordinateCheck(x-1, y-1)):
-        if not self.__hasBeenPlayed(x-1, y-1):
-          self.__revealTile(x-1, y-1)
-          self.__uncoverAdjTiles(x-1, y-1)
-      ## Check the tile to the north
-      if (self.__coordinateCheck(x-1, y)):
-        if not self.__hasBeenPlayed(x-1, y):
-          self.__revealTile(x-1, y)
-          self.__uncoverAdjTiles(x-1, y)
-      ## Check the tile to the north-east
-      if (self.__coordinateCheck(x-1, y+1)):
-        if not self.__hasBeenPlayed(x-1, y+1):
-          self.__revealTile(x-1, y+1)
-          self.__uncoverAdjTiles(x-1, y+1)
-      ## Check the tile to the east
-      if (self.__coordinateCheck(x, y+1)):
-        if not self.__hasBeenPlayed(x, y+1):
-          self.__revealTile(x, y+1)
-          self.__uncoverAdjTiles(x, y+1)
-      ## Check the tile to the south-east
-      if (self.__coordinateCheck(x+1, y+1)):
-        if not self.__hasBeenPlayed(x+1, y+1):
-          self.__revealTile(x+1, y+1)
-          self.__uncoverAdjTiles(x+1, y+1)
-      ## Check the tile to the south
-      if (self.__coordinateCheck(x+1, y)):
-        if not self.__hasBeenPlayed(x+1, y):
-          self.__revealTile(x+1, y)
-          self.__uncoverAdjTiles(x+1, y)
-      ## Check the tile to the south-west
-      if (self.__coordinateCheck(x+1, y-1)):
-        if not self.__hasBeenPlayed(x+1, y-1):
-          self.__revealTile(x+1, y-1)
-          self.__uncoverAdjTiles(x+1, y-1)
+    # The zero region around (x, y) and its numbered border are revealed with
+    # a queue rather than recursion, so large empty regions cannot exceed the
+    # interpreter's recursion limit. Returns the tiles it revealed.
+    revealedTiles = []
+    pendingTiles = deque([(x, y)])
+    while pendingTiles:
+      tileX, tileY = pendingTiles.popleft()
+      for adjX, adjY in self.neighbourCoordinates[tileX * self.yDimension + tileY]:
+        if not self.__hasBeenPlayed(adjX, adjY):
+          revealedTiles.append((adjX, adjY))
+          # Only tiles with a zero value (i.e. no adjacent mines) have
+          # every unplayed neighbour safe to reveal
+          if self.__revealTile(adjX, adjY) == 0:
+            pendingTiles.append((adjX, adjY))
+    return revealedTiles
 
   def makeMove(self, x, y):
    #This is a public function that the AI calls when they have selected a tile to uncover for their move.
+    # Returns the tiles revealed by the move (every mine when one is hit).
     # Sanitize the user input coordinates
     if not self.__coordinateCheck(x, y):
       raise ValueError('invalid coordinate pair chosen')
     # Check if the move has already been made
     if self.__hasBeenPlayed(x, y):
       raise ValueError('move has already been played')
+    firstChangedTile = len(self.changedTiles)
+    value = self.__getValue(x, y)
     # Check if the AI has hit a mine
-    if self.__hasMine(x, y):
+    if value == -9:
       self.__revealMines()
       self.gameOver = True
-      print('AI hits a mine... BOOM!!')
+      self.__log('AI hits a mine... BOOM!!')
     # If a AI selects a tile with a zero value
     # (i.e. no adjacent tiles contain a mine), uncover
     # all adjacent tiles
-    elif self.gameStateBoard[x][y] == 0:
+    elif value == 0:
       self.__revealTile(x,y)
       self.__uncoverAdjTiles(x,y)
       # If there are no move valid moves the AI can make
       # then the game is over; the AI wins!
       if self.movesRemaining == 0:
         self.gameOver = True
-        print('AI Victory!')
+        self.__log('AI Victory!')
     # If the AI selects a tile that contains a
     # non-negative, non-zero value - then just reveal
     # that single tile
-    elif self.gameStateBoard[x][y] > 0:
+    elif value > 0:
       self.__revealTile(x,y)
       if self.movesRemaining == 0:
         self.gameOver = True
-        print('AI Victory')
+        self.__log('AI Victory')
+    revealedTiles = self.changedTiles[firstChangedTile:]
+    if self.recorder is not None:
+      self.recorder.recordMove(x, y, revealedTiles)
+      if self.gameOver:
+        self.recorder.recordEnd(self)
+    return revealedTiles
+
+  def makeMoves(self, moves):
+    #This is a public function that the AI calls to uncover a batch of tiles in one call.
+    # Tiles already uncovered by an earlier move of the batch are skipped and
+    # the batch stops as soon as the game is over. Returns the moves played.
+    playedMoves = []
+    for x, y in moves:
+      if self.gameOver:
+        break
+      if self.__coordinateCheck(x, y) and self.__hasBeenPlayed(x, y):
+        continue
+      self.makeMove(x, y)
+      playedMoves.append((x, y))
+    return playedMoves
 
   def getAIBoard(self):
     # This function returns the 2D AIViewBoard
+    if self.useArrays:
+      return decodeBoard(self.AIViewBoard)
     return self.AIViewBoard
+
+  def getAIBoardArray(self):
+    # This function returns the array-backed AIViewBoard
+    requireNumpy()
+    if self.useArrays:
+      return self.AIViewBoard
+    return encodeBoard(self.AIViewBoard)
+
+  def getChangedTiles(self):
+    # This function returns the tiles revealed since it was last called
+    changedTiles = self.changedTiles
+    self.changedTiles = []
+    return changedTiles
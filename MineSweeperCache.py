@@ -0,0 +1,51 @@
+from collections import OrderedDict
+
+class ComponentCache:
+
+  def __init__(self, maxSize=4096):
+    #Initializes a bounded least-recently-used cache of solved frontier components or constraint groups
+    self.maxSize = maxSize
+    self.entries = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def get(self, key):
+    #Returns the cached value for the key, or None if it is not cached
+    value = self.entries.get(key)
+    if value is None:
+      self.misses += 1
+      return None
+    self.entries.move_to_end(key)
+    self.hits += 1
+    return value
+
+  def put(self, key, value):
+    #Stores a value, evicting the least recently used entry when the cache is full
+    self.entries[key] = value
+    self.entries.move_to_end(key)
+    while len(self.entries) > self.maxSize:
+      self.entries.popitem(last=False)
+      self.evictions += 1
+
+  def clear(self):
+    #Removes every entry and resets the statistics
+    self.entries.clear()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def getStats(self):
+    #Returns the hit, miss and eviction statistics of the cache
+    lookups = self.hits + self.misses
+    return {
+      'size': len(self.entries),
+      'maxSize': self.maxSize,
+      'hits': self.hits,
+      'misses': self.misses,
+      'evictions': self.evictions,
+      'hitRate': (float(self.hits) / lookups) if lookups != 0 else 0.0,
+    }
+
+# Components recur across games, so by default every AI shares one cache
+sharedComponentCache = ComponentCache()
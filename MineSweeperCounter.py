@@ -0,0 +1,139 @@
+from time import monotonic
+
+class CountingTimeout(Exception):
+  #Raised when counting runs past its deadline
+  pass
+
+def _addShifted(target, source, shift):
+  #Adds the polynomial source, multiplied by x^shift, into the polynomial target
+  if len(target) < len(source) + shift:
+    target.extend([0] * (len(source) + shift - len(target)))
+  for power, count in enumerate(source):
+    target[power + shift] += count
+
+def _convolve(first, second):
+  #Multiplies two polynomials given as lists of coefficients
+  product = [0] * (len(first) + len(second) - 1)
+  for firstPower, firstCount in enumerate(first):
+    if firstCount == 0:
+      continue
+    for secondPower, secondCount in enumerate(second):
+      product[firstPower + secondPower] += firstCount * secondCount
+  return product
+
+def _orderVariables(constraints):
+  #Orders the variables so that each constraint stays open for as few steps as possible
+  constraintsOfVariable = {}
+  for position, constraint in enumerate(constraints):
+    for variable in constraint[2]:
+      constraintsOfVariable.setdefault(variable, []).append(position)
+  # Walk the constraints breadth first, starting from the least connected
+  # one, and emit their variables in the order they are first seen
+  neighbours = [set() for constraint in constraints]
+  for positions in constraintsOfVariable.values():
+    for position in positions:
+      neighbours[position].update(positions)
+  order = []
+  seenVariables = set()
+  seenConstraints = set()
+  for start in sorted(range(len(constraints)), key=lambda position: len(neighbours[position])):
+    if start in seenConstraints:
+      continue
+    seenConstraints.add(start)
+    queue = [start]
+    while len(queue) != 0:
+      position = queue.pop(0)
+      for variable in constraints[position][2]:
+        if variable not in seenVariables:
+          seenVariables.add(variable)
+          order.append(variable)
+      for neighbour in sorted(neighbours[position]):
+        if neighbour not in seenConstraints:
+          seenConstraints.add(neighbour)
+          queue.append(neighbour)
+  return order, constraintsOfVariable
+
+def countSolutions(constraints, deadline=None):
+  #Counts the 0/1 solutions of a system of exact sum constraints without enumerating them
+  # Constraints are (tile, value, scope) tuples. Returns (totals, cellTotals) where
+  # totals maps a number of mines to the number of solutions placing that many
+  # mines, and cellTotals maps every variable to the same counts restricted to
+  # solutions in which that variable is a mine. Raises CountingTimeout once
+  # time.monotonic() passes the deadline, if one is given.
+  order, constraintsOfVariable = _orderVariables(constraints)
+  numVariables = len(order)
+  stepOf = dict((variable, step) for step, variable in enumerate(order))
+  firstStep = {}
+  lastStep = {}
+  for step, variable in enumerate(order):
+    for position in constraintsOfVariable[variable]:
+      firstStep.setdefault(position, step)
+      lastStep[position] = step
+
+  # The state between two steps holds, for every constraint that has been
+  # started but not finished, the number of mines it still needs
+  activeBefore = [[]]
+  transitions = []
+  for step, variable in enumerate(order):
+    active = activeBefore[-1]
+    touched = constraintsOfVariable[variable]
+    nextActive = [position for position in active if lastStep[position] != step]
+    nextActive.extend(position for position in touched if firstStep[position] == step and lastStep[position] != step)
+    # For every touched constraint: (slot in the current state or None if it
+    # starts here, its value, number of its variables left after this step)
+    checks = []
+    for position in touched:
+      slot = active.index(position) if firstStep[position] != step else None
+      remainingVariables = sum(1 for other in constraints[position][2] if stepOf[other] > step)
+      checks.append((position, slot, constraints[position][1], remainingVariables))
+    activeBefore.append(nextActive)
+    transitions.append((active, nextActive, checks))
+
+  def transition(step, state, value):
+    #Returns the state reached by assigning value to the variable of this step, or None
+    active, nextActive, checks = transitions[step]
+    needed = dict(zip(active, state))
+    for position, slot, constraintValue, remainingVariables in checks:
+      stillNeeded = (constraintValue if slot is None else state[slot]) - value
+      if stillNeeded < 0 or stillNeeded > remainingVariables:
+        return None
+      needed[position] = stillNeeded
+    return tuple(needed[position] for position in nextActive)
+
+  # Forward pass: number of ways to reach every state, by mines placed so far
+  forward = [{(): [1]}]
+  for step in range(numVariables):
+    if deadline is not None and monotonic() > deadline:
+      raise CountingTimeout()
+    nextLayer = {}
+    for state, counts in forward[step].items():
+      for value in (0, 1):
+        nextState = transition(step, state, value)
+        if nextState is not None:
+          _addShifted(nextLayer.setdefault(nextState, []), counts, value)
+    forward.append(nextLayer)
+
+  # Backward pass: number of ways to finish from every state, combined with
+  # the forward counts to get the solutions in which each variable is a mine
+  cellTotals = {}
+  backward = {(): [1]}
+  for step in range(numVariables - 1, -1, -1):
+    if deadline is not None and monotonic() > deadline:
+      raise CountingTimeout()
+    previousLayer = {}
+    mineCounts = []
+    for state, counts in forward[step].items():
+      completions = []
+      for value in (0, 1):
+        nextState = transition(step, state, value)
+        if nextState is None or nextState not in backward:
+          continue
+        _addShifted(completions, backward[nextState], value)
+        if value == 1:
+          _addShifted(mineCounts, _convolve(counts, backward[nextState]), 1)
+      previousLayer[state] = completions
+    backward = previousLayer
+    cellTotals[order[step]] = dict((numMines, count) for numMines, count in enumerate(mineCounts) if count != 0)
+
+  totals = dict((numMines, count) for numMines, count in enumerate(forward[numVariables].get((), [])) if count != 0)
+  return totals, cellTotals
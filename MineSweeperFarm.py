@@ -0,0 +1,173 @@
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import signal
+import sys
+from time import perf_counter
+
+from MineSweeperBenchmark import formatSummary, getBoardShape, parseBoardArguments, playGame
+
+# Latencies are aggregated in logarithmic buckets 2% wide starting at one
+# microsecond, so chunks stay small to send back however many games they hold
+LATENCY_BUCKET_BASE = 1e-6
+LATENCY_BUCKET_GROWTH = 1.02
+
+def deriveSeed(masterSeed, gameNumber):
+  #Derives the seed of a game from the master seed, independently of the worker playing it
+  digest = hashlib.sha256('{}:{}'.format(masterSeed, gameNumber).encode('ascii')).digest()
+  return int.from_bytes(digest[:8], 'big')
+
+def getLatencyBucket(latency):
+  #Returns the histogram bucket of a latency given in seconds
+  if latency <= LATENCY_BUCKET_BASE:
+    return 0
+  return int(math.log(latency / LATENCY_BUCKET_BASE, LATENCY_BUCKET_GROWTH)) + 1
+
+def getBucketLatency(bucket):
+  #Returns the latency in seconds at the middle of a histogram bucket
+  if bucket == 0:
+    return LATENCY_BUCKET_BASE
+  return LATENCY_BUCKET_BASE * LATENCY_BUCKET_GROWTH ** (bucket - 0.5)
+
+class FarmSummary:
+
+  def __init__(self):
+    #Initializes an empty, mergeable summary of played games
+    self.games = 0
+    self.wins = 0
+    self.moves = 0
+    self.guesses = 0
+    # gameTime sums the time of every game played; wallTime is the time the
+    # whole run took, set by runFarm
+    self.gameTime = 0.0
+    self.wallTime = 0.0
+    self.latencyBuckets = {}
+    self.interrupted = False
+
+  def add(self, result):
+    #Adds the results of one game to the summary
+    self.games += 1
+    self.wins += 1 if result['won'] else 0
+    self.moves += result['moves']
+    self.guesses += result['guesses']
+    self.gameTime += result['time']
+    for latency in result['latencies']:
+      bucket = getLatencyBucket(latency)
+      self.latencyBuckets[bucket] = self.latencyBuckets.get(bucket, 0) + 1
+
+  def merge(self, other):
+    #Adds another summary, e.g. one returned by a worker, to this one
+    self.games += other.games
+    self.wins += other.wins
+    self.moves += other.moves
+    self.guesses += other.guesses
+    self.gameTime += other.gameTime
+    for bucket, count in other.latencyBuckets.items():
+      self.latencyBuckets[bucket] = self.latencyBuckets.get(bucket, 0) + count
+
+  def getLatencyPercentile(self, fraction):
+    #Returns the latency in seconds below which the given fraction of moves fall
+    numLatencies = sum(self.latencyBuckets.values())
+    if numLatencies == 0:
+      return 0.0
+    rank = max(int(math.ceil(fraction * numLatencies)), 1)
+    seen = 0
+    for bucket in sorted(self.latencyBuckets):
+      seen += self.latencyBuckets[bucket]
+      if seen >= rank:
+        return getBucketLatency(bucket)
+
+  def getSummary(self):
+    #Returns the aggregated results as a dictionary, with latencies in milliseconds
+    games = max(self.games, 1)
+    return {
+      'games': self.games,
+      'wins': self.wins,
+      'winRate': float(self.wins) / games,
+      'movesPerGame': float(self.moves) / games,
+      'guessesPerGame': float(self.guesses) / games,
+      'totalTime': self.wallTime,
+      'gameTime': self.gameTime,
+      'latencyP50': self.getLatencyPercentile(0.50) * 1000,
+      'latencyP95': self.getLatencyPercentile(0.95) * 1000,
+      'latencyP99': self.getLatencyPercentile(0.99) * 1000,
+      'interrupted': self.interrupted,
+    }
+
+# Set by the parent process when a run is interrupted or fails, so that
+# workers stop after the game they are playing
+workerStopEvent = None
+
+def initWorker(stopEvent=None):
+  #Leaves Ctrl-C to the parent process, which stops the pool and keeps the partial results
+  global workerStopEvent
+  signal.signal(signal.SIGINT, signal.SIG_IGN)
+  workerStopEvent = stopEvent
+
+def playChunk(chunk):
+  #Worker entry point: plays a range of games and returns their summary
+  rows, cols, mines, masterSeed, firstGame, lastGame, timeBudget = chunk
+  summary = FarmSummary()
+  for gameNumber in range(firstGame, lastGame):
+    if workerStopEvent is not None and workerStopEvent.is_set():
+      break
+    summary.add(playGame(rows, cols, mines, deriveSeed(masterSeed, gameNumber), timeBudget))
+  return summary
+
+def runFarm(rows, cols, mines, games, masterSeed=0, processes=None, chunkSize=100, timeBudget=None, onChunk=None):
+  #Plays games in a pool of worker processes and aggregates their results as chunks arrive
+  # onChunk, if given, is called with the running summary after every chunk.
+  # An interrupted run (Ctrl-C) stops the workers after the games they are
+  # playing and returns a partial summary of every game finished; any other
+  # error stops them the same way and is raised. The pool is always closed
+  # and joined rather than terminated: workers killed while sending back a
+  # result can leave the pool waiting on them forever.
+  chunks = [(rows, cols, mines, masterSeed, firstGame, min(firstGame + chunkSize, games), timeBudget)
+            for firstGame in range(0, games, chunkSize)]
+  summary = FarmSummary()
+  startTime = perf_counter()
+  stopEvent = multiprocessing.Event()
+  pool = multiprocessing.Pool(processes, initWorker, (stopEvent,))
+  try:
+    chunkSummaries = pool.imap_unordered(playChunk, chunks)
+    try:
+      for chunkSummary in chunkSummaries:
+        summary.merge(chunkSummary)
+        if onChunk is not None:
+          onChunk(summary)
+    except KeyboardInterrupt:
+      # Collect the games the workers finish before they stop
+      stopEvent.set()
+      summary.interrupted = True
+      for chunkSummary in chunkSummaries:
+        summary.merge(chunkSummary)
+    pool.close()
+  except BaseException:
+    stopEvent.set()
+    pool.close()
+    raise
+  finally:
+    pool.join()
+  summary.wallTime = perf_counter() - startTime
+  return summary.getSummary()
+
+# Multi-process game farm entry point
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description='Plays MineSweeper games across all cores and reports solver performance.')
+  parseBoardArguments(parser)
+  parser.add_argument('--processes', type=int, help='number of worker processes (default: one per core)')
+  parser.add_argument('--chunk-size', type=int, default=100, help='games played per worker task (default: 100)')
+  arguments = parser.parse_args()
+  rows, cols, mines = getBoardShape(arguments)
+  reportProgress = lambda summary: sys.stderr.write('\r{} / {} games'.format(summary.games, arguments.games))
+  summary = runFarm(rows, cols, mines, arguments.games, arguments.seed, arguments.processes,
+                    arguments.chunk_size, arguments.time_budget, reportProgress)
+  sys.stderr.write('\n')
+  summary.update({'rows': rows, 'cols': cols, 'mines': mines, 'seed': arguments.seed})
+  print('{}x{} board, {} mines{}'.format(rows, cols, mines, ' (interrupted, partial results)' if summary['interrupted'] else ''))
+  print(formatSummary(summary))
+  if arguments.output:
+    with open(arguments.output, 'w') as outputFile:
+      json.dump(summary, outputFile, indent=2, sort_keys=True)
@@ -0,0 +1,60 @@
+from random import Random
+from MineSweeperArrays import np, neighbourhoodSum, MINE
+from MineSweeperBoard import MineSweeperBoard
+from MineSweeperNeighbours import getNeighbourTable
+
+def generateGameStateBoards(xDimension, yDimension, numberMines, count, seed=None):
+  #Generates the game state boards (-9 for a mine, 0-8 otherwise) of many games at once
+  # With NumPy the boards come back as one (count, xDimension, yDimension)
+  # int8 array: mine positions are sampled for every board in a single call
+  # and all adjacency counts are computed in one vectorised pass. Without
+  # NumPy a list of list-of-lists boards is returned instead.
+  area = xDimension * yDimension
+  if numberMines > area or numberMines < 0:
+    raise ValueError('invalid number of mines entered')
+  if np is None:
+    return _generatePythonBoards(xDimension, yDimension, numberMines, count, seed)
+  generator = np.random.default_rng(seed)
+  # The numberMines smallest of area random keys give a uniformly random
+  # set of mine positions for every board
+  keys = generator.random((count, area))
+  mines = np.zeros((count, area), dtype=bool)
+  if numberMines > 0:
+    mineIndices = np.argpartition(keys, numberMines - 1, axis=1)[:, :numberMines]
+    np.put_along_axis(mines, mineIndices, True, axis=1)
+  mines = mines.reshape(count, xDimension, yDimension)
+  return np.where(mines, MINE, neighbourhoodSum(mines)).astype(np.int8)
+
+def _generatePythonBoards(xDimension, yDimension, numberMines, count, seed):
+  #Generates game state boards as lists of lists when NumPy is not installed
+  generator = Random(seed)
+  boards = []
+  for boardNumber in range(count):
+    mineIndices = generator.sample(range(xDimension * yDimension), numberMines)
+    boards.append(buildGameStateBoard(xDimension, yDimension, [divmod(index, yDimension) for index in mineIndices]))
+  return boards
+
+def buildGameStateBoard(xDimension, yDimension, mineCoordinates, useArrays=False):
+  #Builds the game state board (-9 for a mine, 0-8 otherwise) of a known mine layout
+  # Array-backed boards count all tiles in one vectorised pass; list boards
+  # add one to the neighbours of each mine, which is quicker for small boards
+  if useArrays:
+    mines = np.zeros((xDimension, yDimension), dtype=bool)
+    for x, y in mineCoordinates:
+      mines[x, y] = True
+    return np.where(mines, MINE, neighbourhoodSum(mines)).astype(np.int8)
+  neighbourCoordinates = getNeighbourTable(xDimension, yDimension)
+  board = [[0 for y in range(yDimension)] for x in range(xDimension)]
+  for x, y in mineCoordinates:
+    board[x][y] = -9
+  for x, y in mineCoordinates:
+    for adjX, adjY in neighbourCoordinates[x * yDimension + y]:
+      if board[adjX][adjY] != -9:
+        board[adjX][adjY] += 1
+  return board
+
+def generateBoards(xDimension, yDimension, numberMines, count, seed=None, useArrays=False, verbose=False):
+  #Yields count ready-to-play MineSweeperBoards whose layouts were generated in bulk
+  for gameStateBoard in generateGameStateBoards(xDimension, yDimension, numberMines, count, seed):
+    yield MineSweeperBoard(xDimension, yDimension, numberMines, useArrays=useArrays, verbose=verbose,
+                           gameStateBoard=gameStateBoard)
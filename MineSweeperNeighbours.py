@@ -0,0 +1,86 @@
+from functools import lru_cache
+
+# Boards with more tiles than this compute neighbours when they are looked up
+# rather than tabulating them: a table holds a tuple for every tile, which on
+# a 500x500 board takes hundreds of megabytes
+MAX_TABULATED_TILES = 10000
+
+def getNeighbourOffsets(degree=1):
+  #Returns the offsets of the eight neighbours of degree d of a tile
+  # The neighbours of degree d are the eight tiles d steps away to the west,
+  # north-west, north, north-east, east, south-east, south and south-west
+  return ((0, -degree), (-degree, -degree), (-degree, 0), (-degree, degree),
+          (0, degree), (degree, degree), (degree, 0), (degree, -degree))
+
+@lru_cache(maxsize=16)
+def getNeighbourCoordinates(xDimension, yDimension, degree=1):
+  #Returns, for every tile index (x * yDimension + y), the coordinates of its neighbours
+  # Neighbours that fall outside the board are left out
+  offsets = getNeighbourOffsets(degree)
+  table = []
+  for x in range(xDimension):
+    for y in range(yDimension):
+      table.append(tuple((x + offsetX, y + offsetY) for offsetX, offsetY in offsets
+                         if 0 <= x + offsetX < xDimension and 0 <= y + offsetY < yDimension))
+  return tuple(table)
+
+@lru_cache(maxsize=16)
+def getNeighbourIndices(xDimension, yDimension, degree=1):
+  #Returns, for every tile index, the flattened indices of its neighbours
+  offsets = getNeighbourOffsets(degree)
+  table = []
+  for x in range(xDimension):
+    for y in range(yDimension):
+      table.append(tuple((x + offsetX) * yDimension + y + offsetY for offsetX, offsetY in offsets
+                         if 0 <= x + offsetX < xDimension and 0 <= y + offsetY < yDimension))
+  return tuple(table)
+
+def getNeighbourTable(xDimension, yDimension, degree=1, asIndices=False, lazy=False):
+  #Returns the neighbour table of a board shape, indexed by tile index
+  # Tables of boards up to MAX_TABULATED_TILES tiles are computed once and
+  # shared; larger boards (or any board when lazy is set) get a table that
+  # computes every entry when it is looked up and takes no memory
+  if lazy or xDimension * yDimension > MAX_TABULATED_TILES:
+    return LazyNeighbourTable(xDimension, yDimension, degree, asIndices)
+  if asIndices:
+    return getNeighbourIndices(xDimension, yDimension, degree)
+  return getNeighbourCoordinates(xDimension, yDimension, degree)
+
+def getSymbolHistogram(board, coordinates):
+  #Counts every symbol found on the board at the given coordinates in a single pass
+  histogram = {}
+  for x, y in coordinates:
+    symbol = board[x][y]
+    histogram[symbol] = histogram.get(symbol, 0) + 1
+  return histogram
+
+class LazyNeighbourTable:
+
+  def __init__(self, xDimension, yDimension, degree=1, asIndices=False):
+    #Initializes a neighbour table that computes every entry when it is looked up
+    # It is indexed like getNeighbourCoordinates (or getNeighbourIndices when
+    # asIndices is set) but takes no memory, for boards too large to tabulate
+    self.xDimension = xDimension
+    self.yDimension = yDimension
+    self.degree = degree
+    self.asIndices = asIndices
+    self.offsets = getNeighbourOffsets(degree)
+    self.indexOffsets = tuple(offsetX * yDimension + offsetY for offsetX, offsetY in self.offsets)
+
+  def __len__(self):
+    return self.xDimension * self.yDimension
+
+  def __getitem__(self, index):
+    #Returns the neighbours of the tile at the given tile index
+    x, y = divmod(index, self.yDimension)
+    # Tiles away from the edges have every neighbour, so skip the bounds checks
+    degree = self.degree
+    if degree <= x < self.xDimension - degree and degree <= y < self.yDimension - degree:
+      if self.asIndices:
+        return tuple(index + offset for offset in self.indexOffsets)
+      return tuple((x + offsetX, y + offsetY) for offsetX, offsetY in self.offsets)
+    coordinates = tuple((x + offsetX, y + offsetY) for offsetX, offsetY in self.offsets
+                        if 0 <= x + offsetX < self.xDimension and 0 <= y + offsetY < self.yDimension)
+    if self.asIndices:
+      return tuple(adjX * self.yDimension + adjY for adjX, adjY in coordinates)
+    return coordinates
@@ -0,0 +1,139 @@
+import json
+from MineSweeperAI import MineSweeperAI
+from MineSweeperBoard import MineSweeperBoard
+from MineSweeperGenerator import buildGameStateBoard
+
+# Game logs are append-only streams of JSON lines, one event per line:
+# - start = board shape, mine count, seed and mine layout of a new game
+# - solve = tier that produced a batch of AI moves, whether it was a guess, and the moves
+# - move  = tile played on the board, the tier behind it, whether it was a
+#           guess, and every tile the move revealed
+# - end   = whether the game was won
+# Any number of games can be appended to the same stream
+LOG_VERSION = 1
+
+class GameRecorder:
+
+  def __init__(self, destination, flushEvents=False):
+    #Opens an event log on a file path (appended to) or an open file
+    # Events are written as they happen; flushEvents also flushes every one,
+    # otherwise the stream is flushed at the end of every game
+    if hasattr(destination, 'write'):
+      self.file = destination
+      self.ownsFile = False
+    else:
+      self.file = open(destination, 'a')
+      self.ownsFile = True
+    self.flushEvents = flushEvents
+    self.lastTier = None
+
+  def __write(self, event):
+    #Appends one event to the log
+    self.file.write(json.dumps(event, separators=(',', ':')) + '\n')
+    if self.flushEvents:
+      self.file.flush()
+
+  def recordStart(self, board):
+    #Records the start of a game on a MineSweeperBoard
+    self.lastTier = None
+    self.__write({'event': 'start', 'version': LOG_VERSION, 'xDimension': board.xDimension, 'yDimension': board.yDimension,
+                  'numberMines': board.numberMines, 'seed': board.seed if isinstance(board.seed, int) else None,
+                  'mines': [[x, y] for x, y in board.mineCoordinates]})
+
+  def recordSolve(self, tier, moves):
+    #Records a batch of moves chosen by the AI and the tier that produced them
+    self.lastTier = tier
+    self.__write({'event': 'solve', 'tier': tier, 'guess': tier == 'guess', 'moves': [[x, y] for x, y in moves]})
+
+  def recordMove(self, x, y, revealedTiles):
+    #Records a move played on the board and the tiles it revealed
+    self.__write({'event': 'move', 'x': x, 'y': y, 'tier': self.lastTier, 'guess': self.lastTier == 'guess',
+                  'revealed': [[revealedX, revealedY] for revealedX, revealedY in revealedTiles]})
+
+  def recordEnd(self, board):
+    #Records the end of a game
+    self.__write({'event': 'end', 'won': board.movesRemaining == 0, 'movesRemaining': board.movesRemaining})
+    self.file.flush()
+
+  def close(self):
+    #Flushes the log, closing it if it was opened from a path
+    if self.ownsFile:
+      self.file.close()
+    else:
+      self.file.flush()
+
+def readGames(source):
+  #Yields a GameReplay for every game of a log given as a file path, an open file or lines
+  if isinstance(source, str):
+    with open(source) as logFile:
+      for game in readGames(logFile):
+        yield game
+    return
+  events = []
+  for line in source:
+    if not line.strip():
+      continue
+    event = json.loads(line)
+    if event['event'] == 'start' and len(events) != 0:
+      yield GameReplay(events)
+      events = []
+    events.append(event)
+  if len(events) != 0:
+    yield GameReplay(events)
+
+class GameReplay:
+
+  def __init__(self, events):
+    #Initializes the replay of one logged game from its events
+    if len(events) == 0 or events[0]['event'] != 'start':
+      raise ValueError('game log does not begin with a start event')
+    self.start = events[0]
+    self.xDimension = self.start['xDimension']
+    self.yDimension = self.start['yDimension']
+    self.numberMines = self.start['numberMines']
+    self.seed = self.start['seed']
+    self.mineCoordinates = [(x, y) for x, y in self.start['mines']]
+    self.moves = [event for event in events if event['event'] == 'move']
+    self.end = events[-1] if events[-1]['event'] == 'end' else None
+
+  def __len__(self):
+    #Returns the number of logged moves
+    return len(self.moves)
+
+  def getGuesses(self):
+    #Returns the numbers of the moves that were guesses
+    return [moveNumber for moveNumber, move in enumerate(self.moves) if move['guess']]
+
+  def getBoard(self, moveNumber=None, verify=False, useArrays=False, sparse=False):
+    #Returns the board as it was after the first moveNumber moves (all moves by default)
+    # The moves are played on the board straight from the log, without the
+    # solver. With verify, every move must reveal exactly the logged tiles
+    if moveNumber is None:
+      moveNumber = len(self.moves)
+    if moveNumber < 0 or moveNumber > len(self.moves):
+      raise IndexError('move number out of range')
+    board = MineSweeperBoard(self.xDimension, self.yDimension, self.numberMines, useArrays=useArrays, verbose=False,
+                             seed=self.seed, sparse=sparse,
+                             gameStateBoard=buildGameStateBoard(self.xDimension, self.yDimension, self.mineCoordinates, useArrays))
+    for move in self.moves[:moveNumber]:
+      revealedTiles = board.makeMove(move['x'], move['y'])
+      if verify and sorted(revealedTiles) != sorted((x, y) for x, y in move['revealed']):
+        raise ValueError('move {},{} revealed different tiles than logged'.format(move['x'], move['y']))
+    return board
+
+  def getAI(self, moveNumber=None, **options):
+    #Returns a MineSweeperAI that has seen the board after the first moveNumber moves
+    # Calling its makeMoves() re-runs the solver on that position. Keyword
+    # options are passed on to MineSweeperAI
+    board = self.getBoard(moveNumber, sparse=options.get('sparse', False))
+    options.setdefault('verbose', False)
+    AI = MineSweeperAI(self.xDimension, self.yDimension, self.numberMines, **options)
+    AI.updateAIViewBoard(board.getAIBoard(), board.getChangedTiles())
+    return AI
+
+  def play(self):
+    #Re-executes every logged move, checking each against the log, and returns the final board
+    board = self.getBoard(verify=True)
+    if self.end is not None and (board.movesRemaining == 0) != self.end['won']:
+      raise ValueError('replayed game did not end as logged')
+    return board
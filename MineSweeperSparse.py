@@ -0,0 +1,49 @@
+class SparseBoard:
+
+  def __init__(self, xDimension, yDimension, default):
+    #Initializes a board that only stores the tiles that have been set
+    # Tiles are read and written as board[x][y], like a list of lists. Tiles
+    # never set read as the default
+    self.xDimension = xDimension
+    self.yDimension = yDimension
+    self.default = default
+    self.tiles = {}
+
+  def __len__(self):
+    return self.xDimension
+
+  def __getitem__(self, x):
+    return SparseRow(self, x)
+
+  def __iter__(self):
+    #Yields every row as a list; this touches every tile, so it is only meant for printing
+    for x in range(self.xDimension):
+      yield list(SparseRow(self, x))
+
+  def getTile(self, x, y):
+    #Returns the tile at (x, y)
+    return self.tiles.get((x, y), self.default)
+
+  def setTile(self, x, y, value):
+    #Sets the tile at (x, y)
+    self.tiles[(x, y)] = value
+
+class SparseRow:
+
+  def __init__(self, board, x):
+    #Initializes a view of one row of a SparseBoard
+    self.board = board
+    self.x = x
+
+  def __len__(self):
+    return self.board.yDimension
+
+  def __getitem__(self, y):
+    return self.board.getTile(self.x, y)
+
+  def __setitem__(self, y, value):
+    self.board.setTile(self.x, y, value)
+
+  def __iter__(self):
+    for y in range(self.board.yDimension):
+      yield self.board.getTile(self.x, y)
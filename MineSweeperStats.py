@@ -0,0 +1,46 @@
+import json
+
+class SolverStats:
+
+  # Counters kept for every tier
+  FIELDS = ('calls', 'successes', 'time', 'constraints', 'solutions', 'deductions')
+
+  def __init__(self):
+    #Initializes empty per-tier statistics
+    self.tiers = {}
+
+  def record(self, tierName, elapsed, success, constraints=0, solutions=0, deductions=0):
+    #Adds one call of a tier to the statistics
+    tierStats = self.tiers.get(tierName)
+    if tierStats is None:
+      tierStats = dict((field, 0) for field in self.FIELDS)
+      self.tiers[tierName] = tierStats
+    tierStats['calls'] += 1
+    tierStats['successes'] += 1 if success else 0
+    tierStats['time'] += elapsed
+    tierStats['constraints'] += constraints
+    tierStats['solutions'] += solutions
+    tierStats['deductions'] += deductions
+
+  def merge(self, other):
+    #Adds the statistics of another SolverStats, e.g. from another game, to these
+    for tierName, otherStats in other.tiers.items():
+      tierStats = self.tiers.setdefault(tierName, dict((field, 0) for field in self.FIELDS))
+      for field in self.FIELDS:
+        tierStats[field] += otherStats[field]
+
+  def reset(self):
+    #Clears all statistics
+    self.tiers = {}
+
+  def getStats(self):
+    #Returns a copy of the statistics as a dictionary keyed by tier name
+    return dict((tierName, dict(tierStats)) for tierName, tierStats in self.tiers.items())
+
+  def dump(self, destination):
+    #Writes the statistics as JSON to a file path or an open file
+    if hasattr(destination, 'write'):
+      json.dump(self.getStats(), destination, indent=2, sort_keys=True)
+    else:
+      with open(destination, 'w') as statsFile:
+        json.dump(self.getStats(), statsFile, indent=2, sort_keys=True)
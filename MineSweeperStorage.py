@@ -0,0 +1,231 @@
+import mmap
+import struct
+from MineSweeperAI import MineSweeperAI
+from MineSweeperArrays import np, UNKNOWN, REVEALED_MINE, MARKED_MINE
+from MineSweeperBoard import MineSweeperBoard
+from MineSweeperGenerator import buildGameStateBoard
+
+# A board record is a header followed by a bit-packed mine layer (one bit per
+# tile, present for game boards only) and a cell layer of 4-bit tile states,
+# two tiles per byte. Tiles are stored in index order (x * yDimension + y),
+# the lowest bit or nibble first. Tile states are:
+# - 0-8 = Revealed tile with that number of adjacent mines ('-' for 0)
+# -   9 = Unknown tile ('X')
+# -  10 = Revealed mine ('x')
+# -  11 = Tile marked as a mine by the AI ('*')
+RECORD_HEADER = struct.Struct('<IIIIQB3x')
+FLAG_MINES = 1
+FLAG_SEED = 2
+FLAG_GAME_OVER = 4
+STATE_UNKNOWN = 9
+STATE_REVEALED_MINE = 10
+STATE_MARKED_MINE = 11
+STATE_SYMBOLS = ['-', 1, 2, 3, 4, 5, 6, 7, 8, 'X', 'x', '*']
+SYMBOL_STATES = dict((symbol, state) for state, symbol in enumerate(STATE_SYMBOLS))
+STATE_CODES = [0, 1, 2, 3, 4, 5, 6, 7, 8, UNKNOWN, REVEALED_MINE, MARKED_MINE]
+CODE_STATES = dict((code, state) for state, code in enumerate(STATE_CODES))
+
+# A board file holds many records behind a header, followed by a table of
+# record offsets so that any record can be read without reading the others
+FILE_HEADER = struct.Struct('<4sHHQQ')
+FILE_MAGIC = b'MSWB'
+FILE_VERSION = 1
+
+def _packBits(bits):
+  #Packs a sequence of 0/1 values into bytes, lowest bit first
+  if np is not None:
+    return np.packbits(np.asarray(bits, dtype=np.uint8), bitorder='little').tobytes()
+  packed = bytearray((len(bits) + 7) // 8)
+  for index, bit in enumerate(bits):
+    if bit:
+      packed[index >> 3] |= 1 << (index & 7)
+  return bytes(packed)
+
+def _unpackBits(data, count):
+  #Returns the first count bits packed into data, lowest bit first
+  if np is not None:
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=count, bitorder='little').tolist()
+  return [(data[index >> 3] >> (index & 7)) & 1 for index in range(count)]
+
+def _packNibbles(states):
+  #Packs a sequence of 4-bit values into bytes, two per byte, lowest nibble first
+  if np is not None:
+    padded = np.zeros(len(states) + len(states) % 2, dtype=np.uint8)
+    padded[:len(states)] = states
+    return (padded[0::2] | (padded[1::2] << 4)).tobytes()
+  states = list(states) + [0] * (len(states) % 2)
+  return bytes(states[index] | (states[index + 1] << 4) for index in range(0, len(states), 2))
+
+def _unpackNibbles(data, count):
+  #Returns the first count 4-bit values packed into data, lowest nibble first
+  if np is not None:
+    packed = np.frombuffer(data, dtype=np.uint8)
+    states = np.empty(2 * len(packed), dtype=np.uint8)
+    states[0::2] = packed & 15
+    states[1::2] = packed >> 4
+    return states[:count].tolist()
+  states = []
+  for value in data:
+    states.append(value & 15)
+    states.append(value >> 4)
+  return states[:count]
+
+def _getTileStates(board):
+  #Returns the 4-bit state of every tile of an AI view board in index order
+  if np is not None and isinstance(board, np.ndarray):
+    return [CODE_STATES[code] for code in board.ravel().tolist()]
+  return [SYMBOL_STATES[symbol] for row in board for symbol in row]
+
+def _getRecordSize(xDimension, yDimension, flags):
+  #Returns the number of bytes of a record with the given header fields
+  numTiles = xDimension * yDimension
+  mineBytes = (numTiles + 7) // 8 if flags & FLAG_MINES else 0
+  return RECORD_HEADER.size + mineBytes + (numTiles + 1) // 2
+
+def _getStoredSeed(seed):
+  #Returns the seed to store in a record header, or None if it does not fit
+  return seed if isinstance(seed, int) and 0 <= seed < 2 ** 64 else None
+
+def _encodeRecord(xDimension, yDimension, numberMines, movesRemaining, seed, gameOver, mines, states):
+  #Encodes a record from its header fields, mine bits (None if unknown) and tile states
+  flags = (FLAG_MINES if mines is not None else 0) | (FLAG_SEED if seed is not None else 0) | (FLAG_GAME_OVER if gameOver else 0)
+  header = RECORD_HEADER.pack(xDimension, yDimension, numberMines, movesRemaining, seed if seed is not None else 0, flags)
+  return header + (_packBits(mines) if mines is not None else b'') + _packNibbles(states)
+
+def _decodeRecord(data):
+  #Decodes a record into its header fields, mine bits (None if not stored) and tile states
+  xDimension, yDimension, numberMines, movesRemaining, seed, flags = RECORD_HEADER.unpack_from(data)
+  numTiles = xDimension * yDimension
+  offset = RECORD_HEADER.size
+  mines = None
+  if flags & FLAG_MINES:
+    mineBytes = (numTiles + 7) // 8
+    mines = _unpackBits(data[offset:offset + mineBytes], numTiles)
+    offset += mineBytes
+  states = _unpackNibbles(data[offset:offset + (numTiles + 1) // 2], numTiles)
+  seed = seed if flags & FLAG_SEED else None
+  return xDimension, yDimension, numberMines, movesRemaining, seed, bool(flags & FLAG_GAME_OVER), mines, states
+
+def dumpBoard(board):
+  #Returns the record of a MineSweeperBoard: its mines, revealed tiles and seed
+  numTiles = board.xDimension * board.yDimension
+  mines = [0] * numTiles
+  for x, y in board.mineCoordinates:
+    mines[x * board.yDimension + y] = 1
+  return _encodeRecord(board.xDimension, board.yDimension, board.numberMines, board.movesRemaining, _getStoredSeed(board.seed),
+                       board.isGameOver(), mines, _getTileStates(board.AIViewBoard))
+
+def loadBoard(data, useArrays=False, sparse=False, verbose=False):
+  #Returns the MineSweeperBoard stored in a record, in the state it was saved in
+  xDimension, yDimension, numberMines, movesRemaining, seed, gameOver, mines, states = _decodeRecord(data)
+  if mines is None:
+    raise ValueError('record holds an AI board, not a game board')
+  mineCoordinates = [divmod(index, yDimension) for index, bit in enumerate(mines) if bit]
+  board = MineSweeperBoard(xDimension, yDimension, numberMines, useArrays=useArrays, verbose=verbose, seed=seed,
+                           gameStateBoard=buildGameStateBoard(xDimension, yDimension, mineCoordinates, useArrays), sparse=sparse)
+  tileSymbols = STATE_CODES if useArrays else STATE_SYMBOLS
+  for index, state in enumerate(states):
+    if state != STATE_UNKNOWN:
+      x, y = divmod(index, yDimension)
+      board.AIViewBoard[x][y] = tileSymbols[state]
+      board.changedTiles.append((x, y))
+  board.movesRemaining = movesRemaining
+  board.gameOver = gameOver
+  return board
+
+def dumpAIBoard(AI):
+  #Returns the record of the board as a MineSweeperAI sees it, including the mines it has marked
+  board = AI.AIBoard
+  if board is None:
+    board = [['X' for y in range(AI.yDimension)] for x in range(AI.xDimension)]
+  states = _getTileStates(board)
+  movesRemaining = AI.xDimension * AI.yDimension - AI.numberMines - sum(1 for state in states if state <= 8)
+  return _encodeRecord(AI.xDimension, AI.yDimension, AI.numberMines, movesRemaining, _getStoredSeed(AI.seed), False, None, states)
+
+def loadAIBoard(data, **options):
+  #Returns a MineSweeperAI that has seen the board stored in a record (a game or AI board)
+  # Keyword options are passed on to MineSweeperAI. The AI takes the stored
+  # seed only from an AI record; a game record's seed placed the mines
+  xDimension, yDimension, numberMines, movesRemaining, seed, gameOver, mines, states = _decodeRecord(data)
+  if mines is None:
+    options.setdefault('seed', seed)
+  options.setdefault('verbose', False)
+  AI = MineSweeperAI(xDimension, yDimension, numberMines, **options)
+  board = [[STATE_SYMBOLS[state] for state in states[x * yDimension:(x + 1) * yDimension]] for x in range(xDimension)]
+  AI.updateAIViewBoard(board)
+  return AI
+
+def writeBoardFile(path, boards):
+  #Writes game boards, AIs or records to one file, in order, and returns how many were written
+  offsets = []
+  with open(path, 'wb') as boardFile:
+    boardFile.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, 0, 0, 0))
+    for board in boards:
+      if isinstance(board, MineSweeperAI):
+        record = dumpAIBoard(board)
+      elif isinstance(board, MineSweeperBoard):
+        record = dumpBoard(board)
+      else:
+        record = bytes(board)
+      offsets.append(boardFile.tell())
+      boardFile.write(record)
+    indexOffset = boardFile.tell()
+    boardFile.write(struct.pack('<{}Q'.format(len(offsets)), *offsets))
+    boardFile.seek(0)
+    boardFile.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, 0, len(offsets), indexOffset))
+  return len(offsets)
+
+class BoardFile:
+
+  def __init__(self, path):
+    #Opens a board file written by writeBoardFile; records are memory-mapped, not read up front
+    self.file = open(path, 'rb')
+    try:
+      self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+      self.file.close()
+      raise ValueError('not a board file')
+    magic, version, reserved, self.count, self.indexOffset = FILE_HEADER.unpack_from(self.map) \
+      if len(self.map) >= FILE_HEADER.size else (None, None, None, 0, 0)
+    if magic != FILE_MAGIC or version != FILE_VERSION:
+      self.close()
+      raise ValueError('not a board file')
+
+  def __len__(self):
+    return self.count
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exception):
+    self.close()
+
+  def close(self):
+    #Closes the memory map and the file
+    self.map.close()
+    self.file.close()
+
+  def getRecord(self, boardNumber):
+    #Returns the raw record of a board; only the pages holding it are read from the file
+    if boardNumber < 0:
+      boardNumber += self.count
+    if boardNumber < 0 or boardNumber >= self.count:
+      raise IndexError('board number out of range')
+    offset = struct.unpack_from('<Q', self.map, self.indexOffset + 8 * boardNumber)[0]
+    xDimension, yDimension, numberMines, movesRemaining, seed, flags = RECORD_HEADER.unpack_from(self.map, offset)
+    return self.map[offset:offset + _getRecordSize(xDimension, yDimension, flags)]
+
+  def loadBoard(self, boardNumber, useArrays=False, sparse=False, verbose=False):
+    #Returns the game board stored under a board number
+    return loadBoard(self.getRecord(boardNumber), useArrays, sparse, verbose)
+
+  def loadAIBoard(self, boardNumber, **options):
+    #Returns a MineSweeperAI that has seen the board stored under a board number
+    return loadAIBoard(self.getRecord(boardNumber), **options)
+
+  def __getitem__(self, boardNumber):
+    return self.loadBoard(boardNumber)
+
+  def __iter__(self):
+    for boardNumber in range(self.count):
+      yield self.loadBoard(boardNumber)
@@ -0,0 +1,49 @@
+# The AI finds its moves by running an ordered pipeline of stages, cheapest
+# first. A stage looks at the AI's board and either queues safe tiles, marks
+# mines or, as a last resort, queues a guess. Stages use the AI's public
+# solving interface:
+# - AI.getConstraints() = (tile index, unknown mines, sorted tuple of unknown
+#                         tile indices) for every frontier number
+# - AI.applyDeduction(x, y, value) = queues a safe tile (0) or marks a mine (1)
+# - AI.isOutOfTime() = whether the time budget of the current move is used up
+# - AI.runBuiltinTier(name) = runs one of the built-in tiers below
+BUILTIN_TIERS = ('firstDegree', 'secondDegree', 'thirdDegree', 'linear', 'global', 'guess')
+
+# Tiers run by default, in order
+DEFAULT_PIPELINE = BUILTIN_TIERS
+
+class SolverStage:
+
+  # Name the stage is reported and instrumented under
+  name = 'stage'
+
+  # Whether the stage still runs once the time budget of a move is used up
+  # (only the fallback guess does by default)
+  runsWhenOutOfTime = False
+
+  def run(self, AI):
+    #Looks for moves on the AI's board; returns whether it queued a move or marked a mine
+    raise NotImplementedError
+
+class BuiltinStage(SolverStage):
+
+  def __init__(self, name):
+    #Initializes a stage that runs one of the AI's built-in tiers
+    if name not in BUILTIN_TIERS:
+      raise ValueError('unknown solver tier: {}'.format(name))
+    self.name = name
+    self.runsWhenOutOfTime = name == 'guess'
+
+  def run(self, AI):
+    return AI.runBuiltinTier(self.name)
+
+def buildPipeline(stages=None):
+  #Returns the stage objects of a pipeline given as stage objects and/or built-in tier names
+  # A pipeline needs a fallback stage that runs regardless of the time budget
+  # (such as 'guess'): without one the AI can be left with no move to make
+  if stages is None:
+    stages = DEFAULT_PIPELINE
+  pipeline = [BuiltinStage(stage) if isinstance(stage, str) else stage for stage in stages]
+  if not any(stage.runsWhenOutOfTime for stage in pipeline):
+    raise ValueError('solver pipeline has no fallback stage such as guess')
+  return pipeline
@@ -24,6 +24,7 @@ __all__ = [
     "AllEqualConstraint",
     "MaxSumConstraint",
     "ExactSumConstraint",
+    "BinarySumConstraint",
     "MinSumConstraint",
     "InSetConstraint",
     "NotInSetConstraint",
@@ -1194,6 +1195,75 @@ class ExactSumConstraint(Constraint):
             return sum == exactsum
 
 
+class BinarySumConstraint(Constraint):
+    """
+    Constraint enforcing that exactly a given number of 0/1 variables
+    are set to 1
+
+    Behaves like L{ExactSumConstraint} on variables whose domains hold
+    only 0 and 1, but counts assigned ones and unassigned variables in
+    a single pass, and with forward checking forces every unassigned
+    variable as soon as the count becomes tight: to 0 once enough ones
+    are assigned, and to 1 once every remaining variable is needed.
+
+    Example:
+
+    >>> problem = Problem()
+    >>> problem.addVariables(["a", "b", "c"], [0, 1])
+    >>> problem.addConstraint(BinarySumConstraint(2))
+    >>> sorted(sorted(x.items()) for x in problem.getSolutions())
+    [[('a', 0), ('b', 1), ('c', 1)], [('a', 1), ('b', 0), ('c', 1)], [('a', 1), ('b', 1), ('c', 0)]]
+    """
+
+    def __init__(self, count):
+        """
+        @param count: Number of variables that must be set to 1
+        @type  count: int
+        """
+        self._count = count
+
+    def preProcess(self, variables, domains, constraints, vconstraints):
+        count = self._count
+        for variable in variables:
+            domain = domains[variable]
+            for value in domain[:]:
+                if value not in (0, 1):
+                    domain.remove(value)
+            # A count of zero or of every variable leaves a single value
+            if count == 0 and 1 in domain:
+                domain.remove(1)
+            elif count == len(variables) and 0 in domain:
+                domain.remove(0)
+        Constraint.preProcess(self, variables, domains, constraints, vconstraints)
+
+    def __call__(self, variables, domains, assignments, forwardcheck=False):
+        count = self._count
+        ones = 0
+        unassigned = 0
+        for variable in variables:
+            if variable in assignments:
+                ones += assignments[variable]
+            else:
+                unassigned += 1
+        if ones > count or ones + unassigned < count:
+            return False
+        if forwardcheck and unassigned:
+            if ones == count:
+                forced = 0
+            elif ones + unassigned == count:
+                forced = 1
+            else:
+                return True
+            for variable in variables:
+                if variable not in assignments:
+                    domain = domains[variable]
+                    if 1 - forced in domain:
+                        domain.hideValue(1 - forced)
+                    if not domain:
+                        return False
+        return True
+
+
 class MinSumConstraint(Constraint):
     """
     Constraint enforcing that values of given variables sum at least
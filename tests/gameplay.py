@@ -0,0 +1,17 @@
+import random
+from MineSweeperAI import MineSweeperAI
+from MineSweeperBoard import MineSweeperBoard
+
+def playGames(seeds, rows=16, cols=30, mines=99, recorder=None, **options):
+  #Plays a seeded game for every seed, yielding (gameboard, AI, changedTiles) before every batch of moves
+  # The AI has just been shown the board; the caller chooses the moves and
+  # plays them on the gameboard before asking for the next position. Keyword
+  # options are passed on to MineSweeperAI
+  for seed in seeds:
+    generator = random.Random(seed)
+    gameboard = MineSweeperBoard(rows, cols, mines, verbose=False, rng=generator, recorder=recorder)
+    AI = MineSweeperAI(rows, cols, mines, verbose=False, rng=generator, recorder=recorder, **options)
+    while not gameboard.isGameOver():
+      changedTiles = gameboard.getChangedTiles()
+      AI.updateAIViewBoard(gameboard.getAIBoard(), changedTiles)
+      yield gameboard, AI, changedTiles
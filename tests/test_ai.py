@@ -0,0 +1,151 @@
+import itertools
+import unittest
+from unittest import mock
+from gameplay import playGames
+from MineSweeperAI import MineSweeperAI
+from MineSweeperBoard import MineSweeperBoard
+from MineSweeperStrategies import buildPipeline
+
+class SeedTest(unittest.TestCase):
+
+  def playFirstMove(self, rows, cols, mines, seed):
+    #Plays the AI's first move on a board built with the same seed and returns whether it hit a mine
+    gameboard = MineSweeperBoard(rows, cols, mines, verbose=False, seed=seed)
+    AI = MineSweeperAI(rows, cols, mines, verbose=False, seed=seed)
+    AI.updateAIViewBoard(gameboard.getAIBoard(), gameboard.getChangedTiles())
+    x, y = AI.makeMove()
+    return (x, y) in gameboard.mineCoordinates
+
+  def test_equal_seeds_do_not_lose_on_first_move(self):
+    # About one first guess in eight hits a mine; with correlated streams every one did
+    for rows, cols, mines in ((9, 9, 10), (16, 30, 99)):
+      losses = sum(self.playFirstMove(rows, cols, mines, seed) for seed in range(100))
+      self.assertLess(losses, 50)
+
+  def test_seed_replays_the_same_guesses(self):
+    moves = []
+    for attempt in range(2):
+      AI = MineSweeperAI(9, 9, 10, verbose=False, seed=7)
+      AI.updateAIViewBoard([['X'] * 9 for x in range(9)])
+      moves.append(AI.makeMove())
+    self.assertEqual(moves[0], moves[1])
+
+class DeductionTest(unittest.TestCase):
+
+  def test_marked_mines_match_the_board(self):
+    # Tiers deduce some tiles more than once; only the first deduction may count
+    for gameboard, AI, changedTiles in playGames(range(10)):
+      gameboard.makeMoves(AI.makeMoves())
+      markedTiles = sum(row.count('*') for row in AI.AIBoard)
+      self.assertEqual(AI.markedMines, markedTiles)
+      self.assertEqual(AI.unknownTiles, sum(row.count('X') for row in AI.AIBoard))
+
+  def test_stage_reports_list_resolved_tiles(self):
+    for gameboard, AI, changedTiles in playGames(range(5)):
+      markedBefore = AI.markedMines
+      moves = AI.makeMoves()
+      reports = AI.getStageReports()
+      safeTiles = [tile for report in reports for tile in report['safe'] + report['guesses']]
+      mineTiles = [tile for report in reports for tile in report['mines']]
+      self.assertEqual(sorted(safeTiles), sorted(moves))
+      self.assertEqual(len(mineTiles), AI.markedMines - markedBefore)
+      self.assertTrue(all(AI.AIBoard[x][y] == '*' and (x, y) in gameboard.mineCoordinates for x, y in mineTiles))
+      for report in reports:
+        self.assertEqual(report['found'], len(report['safe']) + len(report['mines']) + len(report['guesses']))
+        self.assertEqual(len(report['guesses']) != 0, report['stage'] == 'guess' and report['success'])
+      gameboard.makeMoves(moves)
+
+class SparseTest(unittest.TestCase):
+
+  def test_sparse_mode_solves_like_dense_mode(self):
+    # Guesses are drawn differently in sparse mode, so both AIs see the dense AI's game
+    for seed in range(5):
+      sparseAI = MineSweeperAI(16, 30, 99, verbose=False, seed=seed, sparse=True)
+      for gameboard, denseAI, changedTiles in playGames([seed]):
+        sparseAI.updateAIViewBoard(gameboard.getAIBoard(), changedTiles)
+        # Sparse mode lists the frontier tiles; every other tile has the interior probability
+        frontierProbabilities = sparseAI.getMineProbabilities()
+        interiorProbability = sparseAI.getInteriorProbability()
+        for coordinate, probability in denseAI.getMineProbabilities().items():
+          self.assertAlmostEqual(frontierProbabilities.get(coordinate, interiorProbability), probability)
+        moves = denseAI.makeMoves()
+        sparseMoves = sparseAI.makeMoves()
+        if denseAI.lastTier != 'guess':
+          self.assertEqual(sorted(sparseMoves), sorted(moves))
+        self.assertEqual((sparseAI.unknownTiles, sparseAI.markedMines), (denseAI.unknownTiles, denseAI.markedMines))
+        gameboard.makeMoves(moves)
+
+class LinearTest(unittest.TestCase):
+
+  def solveFrontier(self, numbers, numberMines):
+    #Runs the linear tier on a row of unknown tiles above a row of numbers
+    AI = MineSweeperAI(2, len(numbers), numberMines, verbose=False, seed=0, pipeline=['linear', 'guess'])
+    AI.updateAIViewBoard([['X'] * len(numbers), list(numbers)])
+    moves = AI.makeMoves()
+    return AI, moves
+
+  def test_forced_tiles_are_found(self):
+    # 1-2-1: both ends are mines and the middle is safe
+    AI, moves = self.solveFrontier([1, 2, 1], 2)
+    self.assertEqual(AI.lastTier, 'linear')
+    self.assertEqual(moves, [(0, 1)])
+    self.assertEqual(AI.AIBoard[0], ['*', 'X', '*'])
+    # 1-2-2-1: the middle two are mines and both ends are safe
+    AI, moves = self.solveFrontier([1, 2, 2, 1], 2)
+    self.assertEqual(AI.lastTier, 'linear')
+    self.assertEqual(sorted(moves), [(0, 0), (0, 3)])
+    self.assertEqual(AI.AIBoard[0], ['X', '*', '*', 'X'])
+
+  def test_undetermined_tiles_are_not_forced(self):
+    # 1-1: the mine can be on either tile
+    AI, moves = self.solveFrontier([1, 1], 1)
+    self.assertEqual(AI.lastTier, 'guess')
+    self.assertEqual(AI.markedMines, 0)
+
+  def test_linear_moves_never_hit_a_mine(self):
+    for gameboard, AI, changedTiles in playGames(range(10), pipeline=['firstDegree', 'linear', 'guess']):
+      moves = AI.makeMoves()
+      if AI.lastTier != 'guess':
+        self.assertFalse(any(move in gameboard.mineCoordinates for move in moves))
+      # Every tile marked as a mine was deduced, so it must be a mine
+      markedTiles = [(x, y) for x in range(16) for y in range(30) if AI.AIBoard[x][y] == '*']
+      self.assertTrue(all(tile in gameboard.mineCoordinates for tile in markedTiles))
+      gameboard.makeMoves(moves)
+
+class TimeBudgetTest(unittest.TestCase):
+
+  def solvePosition(self, timeBudget=None):
+    #Solves a position the second degree tier can prove a move on
+    AI = MineSweeperAI(3, 3, 1, verbose=False, seed=0, timeBudget=timeBudget)
+    AI.updateAIViewBoard([['-', 1, 'X'], ['-', 1, 'X'], ['-', 1, 'X']])
+    return AI, AI.makeMoves()
+
+  def test_out_of_time_move_falls_back_to_a_guess(self):
+    AI, moves = self.solvePosition()
+    self.assertEqual((AI.lastTier, AI.timedOutTier), ('secondDegree', None))
+    # Every clock reading is a second later than the last, so the budget runs
+    # out before the first tier (0.5s) or right after it (1.5s)
+    for timeBudget in (0.5, 1.5):
+      with mock.patch('MineSweeperAI.monotonic', side_effect=itertools.count()):
+        AI, moves = self.solvePosition(timeBudget)
+      self.assertEqual(AI.lastTier, 'guess')
+      self.assertEqual(len(moves), 1)
+      self.assertEqual(AI.AIBoard[moves[0][0]][moves[0][1]], 'X')
+      reports = AI.getStageReports()
+      self.assertIn(AI.timedOutTier, [report['stage'] for report in reports if report['stage'] != 'guess'])
+      skippedStages = [report['stage'] for report in reports if not report['ran']]
+      self.assertIn('secondDegree', skippedStages)
+      self.assertNotIn('guess', skippedStages)
+      for report in reports:
+        if not report['ran']:
+          self.assertEqual((report['success'], report['found']), (False, 0))
+
+class PipelineTest(unittest.TestCase):
+
+  def test_pipeline_needs_a_fallback_stage(self):
+    with self.assertRaises(ValueError):
+      buildPipeline(['firstDegree', 'global'])
+    self.assertEqual([stage.name for stage in buildPipeline(['firstDegree', 'guess'])], ['firstDegree', 'guess'])
+
+if __name__ == '__main__':
+  unittest.main()
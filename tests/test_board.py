@@ -0,0 +1,29 @@
+import unittest
+from MineSweeperBoard import MineSweeperBoard
+
+class SparseBoardTest(unittest.TestCase):
+
+  def test_sparse_board_matches_dense_board(self):
+    for seed in range(5):
+      dense = MineSweeperBoard(40, 60, 300, verbose=False, seed=seed)
+      sparse = MineSweeperBoard(40, 60, 300, verbose=False, seed=seed, sparse=True)
+      self.assertEqual(sorted(sparse.mineCoordinates), sorted(dense.mineCoordinates))
+      # Play the same safe tiles on both boards, the zero tiles (and their
+      # flood fills) first, so the sparse board counts every tile's value
+      for values in ((0,), range(1, 9)):
+        for x in range(40):
+          for y in range(60):
+            if dense.AIViewBoard[x][y] == 'X' and dense.gameStateBoard[x][y] in values:
+              self.assertEqual(sorted(sparse.makeMove(x, y)), sorted(dense.makeMove(x, y)))
+        self.assertEqual(list(sparse.AIViewBoard), dense.AIViewBoard)
+        self.assertEqual(sparse.movesRemaining, dense.movesRemaining)
+      self.assertTrue(sparse.isGameOver())
+      # Hitting a mine reveals every mine on both boards
+      sparse = MineSweeperBoard(40, 60, 300, verbose=False, seed=seed, sparse=True)
+      dense = MineSweeperBoard(40, 60, 300, verbose=False, seed=seed)
+      x, y = dense.mineCoordinates[0]
+      self.assertEqual(sorted(sparse.makeMove(x, y)), sorted(dense.makeMove(x, y)))
+      self.assertEqual(list(sparse.AIViewBoard), dense.AIViewBoard)
+
+if __name__ == '__main__':
+  unittest.main()
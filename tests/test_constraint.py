@@ -0,0 +1,88 @@
+import random
+import unittest
+from itertools import product
+from constraint import BacktrackingSolver, BinarySumConstraint, Domain, ExactSumConstraint, MinConflictsSolver, Problem, RecursiveBacktrackingSolver
+
+SOLVERS = (
+  lambda: BacktrackingSolver(forwardcheck=True),
+  lambda: BacktrackingSolver(forwardcheck=False),
+  lambda: RecursiveBacktrackingSolver(forwardcheck=True),
+  lambda: RecursiveBacktrackingSolver(forwardcheck=False),
+)
+
+def randomSystem(generator):
+  #Returns random 0/1 variables and (count, scope) pairs over them, as a minesweeper frontier gives
+  variables = ['v{}'.format(index) for index in range(generator.randint(1, 8))]
+  system = []
+  for position in range(generator.randint(1, 5)):
+    scope = generator.sample(variables, generator.randint(1, len(variables)))
+    system.append((generator.randint(0, len(scope)), scope))
+  return variables, system
+
+def solve(solver, variables, system, constraintType):
+  #Returns every solution of a system as a sorted list of sorted (variable, value) lists
+  problem = Problem(solver)
+  problem.addVariables(variables, [0, 1])
+  for count, scope in system:
+    problem.addConstraint(constraintType(count), scope)
+  return sorted(sorted(solution.items()) for solution in problem.getSolutions())
+
+def isSolution(solution, system):
+  #Returns whether an assignment meets every count of a system
+  return all(sum(solution[variable] for variable in scope) == count for count, scope in system)
+
+class BinarySumConstraintTest(unittest.TestCase):
+
+  def test_solutions_match_exact_sum(self):
+    generator = random.Random(0)
+    for attempt in range(200):
+      variables, system = randomSystem(generator)
+      expected = [sorted(zip(variables, values)) for values in product((0, 1), repeat=len(variables))
+                  if isSolution(dict(zip(variables, values)), system)]
+      for makeSolver in SOLVERS:
+        self.assertEqual(solve(makeSolver(), variables, system, ExactSumConstraint), sorted(expected))
+        self.assertEqual(solve(makeSolver(), variables, system, BinarySumConstraint), sorted(expected))
+
+  def test_min_conflicts_solutions_are_valid(self):
+    generator = random.Random(1)
+    found = 0
+    for attempt in range(50):
+      variables, system = randomSystem(generator)
+      problem = Problem(MinConflictsSolver(steps=200))
+      problem.addVariables(variables, [0, 1])
+      for count, scope in system:
+        problem.addConstraint(BinarySumConstraint(count), scope)
+      solution = problem.getSolution()
+      if solution is not None:
+        self.assertTrue(isSolution(solution, system))
+        found += 1
+    self.assertGreater(found, 0)
+
+  def preProcess(self, count, values):
+    #Preprocesses a constraint over three variables and returns their domains
+    variables = ['a', 'b', 'c']
+    domains = dict((variable, Domain(values)) for variable in variables)
+    constraint = BinarySumConstraint(count)
+    constraints = [(constraint, variables)]
+    vconstraints = dict((variable, [(constraint, variables)]) for variable in variables)
+    constraint.preProcess(variables, domains, constraints, vconstraints)
+    return [sorted(domains[variable]) for variable in variables]
+
+  def test_preprocess_resolves_tight_counts(self):
+    self.assertEqual(self.preProcess(0, [0, 1]), [[0], [0], [0]])
+    self.assertEqual(self.preProcess(3, [0, 1]), [[1], [1], [1]])
+    self.assertEqual(self.preProcess(1, [0, 1]), [[0, 1], [0, 1], [0, 1]])
+    # Values other than 0 and 1 can never count towards the sum
+    self.assertEqual(self.preProcess(1, [0, 1, 2, -1]), [[0, 1], [0, 1], [0, 1]])
+    self.assertEqual(self.preProcess(0, [1, 2]), [[], [], []])
+
+  def test_tight_counts_solve_like_exact_sum(self):
+    for count in (0, 3):
+      for makeSolver in SOLVERS:
+        system = [(count, ['a', 'b', 'c'])]
+        expected = solve(makeSolver(), ['a', 'b', 'c'], system, ExactSumConstraint)
+        self.assertEqual(len(expected), 1)
+        self.assertEqual(solve(makeSolver(), ['a', 'b', 'c'], system, BinarySumConstraint), expected)
+
+if __name__ == '__main__':
+  unittest.main()
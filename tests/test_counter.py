@@ -0,0 +1,78 @@
+import random
+import unittest
+from itertools import combinations, product
+from MineSweeperAI import MineSweeperAI
+from MineSweeperBoard import MineSweeperBoard
+from MineSweeperCache import ComponentCache
+from MineSweeperCounter import countSolutions
+from MineSweeperNeighbours import getNeighbourCoordinates
+
+def bruteForceCount(constraints):
+  #Counts the solutions of a constraint system by trying every assignment
+  variables = sorted(set(variable for constraint in constraints for variable in constraint[2]))
+  totals = {}
+  cellTotals = dict((variable, {}) for variable in variables)
+  for values in product((0, 1), repeat=len(variables)):
+    assignment = dict(zip(variables, values))
+    if all(sum(assignment[variable] for variable in scope) == value for tile, value, scope in constraints):
+      numMines = sum(values)
+      totals[numMines] = totals.get(numMines, 0) + 1
+      for variable in variables:
+        if assignment[variable] == 1:
+          cellTotals[variable][numMines] = cellTotals[variable].get(numMines, 0) + 1
+  return totals, cellTotals
+
+def bruteForceProbabilities(board, numberMines):
+  #Returns the mine probability of every unknown tile by trying every mine layout
+  xDimension, yDimension = len(board), len(board[0])
+  neighbourCoordinates = getNeighbourCoordinates(xDimension, yDimension)
+  unknownTiles = [(x, y) for x in range(xDimension) for y in range(yDimension) if board[x][y] == 'X']
+  numberedTiles = [(x, y, board[x][y]) for x in range(xDimension) for y in range(yDimension) if isinstance(board[x][y], int)]
+  layouts = 0
+  mineCounts = dict((tile, 0) for tile in unknownTiles)
+  for mines in combinations(unknownTiles, numberMines):
+    mines = set(mines)
+    if all(sum(1 for tile in neighbourCoordinates[x * yDimension + y] if tile in mines) == value for x, y, value in numberedTiles):
+      layouts += 1
+      for tile in mines:
+        mineCounts[tile] += 1
+  return dict((tile, float(count) / layouts) for tile, count in mineCounts.items())
+
+class CountSolutionsTest(unittest.TestCase):
+
+  def test_counts_match_brute_force(self):
+    generator = random.Random(0)
+    for attempt in range(300):
+      variables = list(range(generator.randint(1, 10)))
+      constraints = []
+      for position in range(generator.randint(1, 5)):
+        scope = tuple(sorted(generator.sample(variables, generator.randint(1, min(len(variables), 8)))))
+        constraints.append((position, generator.randint(0, len(scope)), scope))
+      totals, cellTotals = countSolutions(constraints)
+      expectedTotals, expectedCellTotals = bruteForceCount(constraints)
+      self.assertEqual(totals, expectedTotals)
+      self.assertEqual(cellTotals, expectedCellTotals)
+
+class MineProbabilitiesTest(unittest.TestCase):
+
+  def test_probabilities_match_brute_force(self):
+    generator = random.Random(1)
+    positions = 0
+    while positions < 20:
+      gameboard = MineSweeperBoard(4, 5, 4, verbose=False, rng=generator)
+      safeTiles = [(x, y) for x in range(4) for y in range(5) if (x, y) not in gameboard.mineCoordinates]
+      for move in generator.sample(safeTiles, generator.randint(1, 2)):
+        gameboard.makeMoves([move])
+      if gameboard.isGameOver():
+        continue
+      AI = MineSweeperAI(4, 5, 4, componentCache=ComponentCache(), verbose=False)
+      AI.updateAIViewBoard(gameboard.getAIBoard())
+      probabilities = AI.getMineProbabilities()
+      expected = bruteForceProbabilities(gameboard.getAIBoard(), 4)
+      self.assertEqual(sorted(probabilities), sorted(expected))
+      for tile, probability in expected.items():
+        self.assertAlmostEqual(probabilities[tile], probability)
+      positions += 1
+
+if __name__ == '__main__':
+  unittest.main()
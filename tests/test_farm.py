@@ -0,0 +1,26 @@
+import unittest
+from MineSweeperFarm import runFarm
+
+class FarmTest(unittest.TestCase):
+
+  def test_worker_error_is_raised(self):
+    with self.assertRaisesRegex(ValueError, 'invalid number of mines'):
+      runFarm(9, 9, 100, 4, processes=2, chunkSize=2)
+
+  def test_every_game_is_played(self):
+    summary = runFarm(9, 9, 10, 6, processes=2, chunkSize=2)
+    self.assertEqual(summary['games'], 6)
+    self.assertFalse(summary['interrupted'])
+    self.assertGreater(summary['totalTime'], 0.0)
+    self.assertGreater(summary['gameTime'], 0.0)
+
+  def test_interrupted_run_keeps_finished_games(self):
+    def interrupt(summary):
+      raise KeyboardInterrupt
+    summary = runFarm(9, 9, 10, 200, processes=2, chunkSize=10, onChunk=interrupt)
+    self.assertTrue(summary['interrupted'])
+    self.assertGreaterEqual(summary['games'], 10)
+    self.assertLess(summary['games'], 200)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+from MineSweeperNeighbours import MAX_TABULATED_TILES, LazyNeighbourTable, getNeighbourTable
+
+class NeighbourTableTest(unittest.TestCase):
+
+  def test_lazy_tables_match_tabulated_tables(self):
+    for xDimension, yDimension in ((1, 1), (1, 7), (4, 5), (9, 9), (16, 30)):
+      for degree in (1, 2):
+        for asIndices in (False, True):
+          table = getNeighbourTable(xDimension, yDimension, degree, asIndices)
+          lazyTable = getNeighbourTable(xDimension, yDimension, degree, asIndices, lazy=True)
+          self.assertIsInstance(lazyTable, LazyNeighbourTable)
+          self.assertEqual(len(table), len(lazyTable))
+          self.assertEqual([table[index] for index in range(len(table))], [lazyTable[index] for index in range(len(lazyTable))])
+
+  def test_large_boards_are_not_tabulated(self):
+    self.assertIsInstance(getNeighbourTable(500, 500), LazyNeighbourTable)
+    self.assertNotIsInstance(getNeighbourTable(1, MAX_TABULATED_TILES), LazyNeighbourTable)
+    self.assertIsInstance(getNeighbourTable(1, MAX_TABULATED_TILES + 1), LazyNeighbourTable)
+
+if __name__ == '__main__':
+  unittest.main()
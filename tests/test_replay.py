@@ -0,0 +1,45 @@
+import io
+import unittest
+from gameplay import playGames
+from MineSweeperBenchmark import runBenchmark
+from MineSweeperReplay import GameRecorder, readGames
+
+class ReplayTest(unittest.TestCase):
+
+  def test_benchmark_games_replay(self):
+    stream = io.StringIO()
+    recorder = GameRecorder(stream)
+    summary = runBenchmark(9, 9, 10, 20, seed=3, recorder=recorder)
+    recorder.close()
+    stream.seek(0)
+    games = list(readGames(stream))
+    self.assertEqual(len(games), 20)
+    self.assertEqual(sum(game.end['won'] for game in games), summary['wins'])
+    self.assertAlmostEqual(sum(len(game) for game in games), summary['movesPerGame'] * 20)
+    for game in games:
+      board = game.play()
+      self.assertEqual(board.movesRemaining == 0, game.end['won'])
+      self.assertTrue(board.isGameOver())
+
+  def test_AI_sees_the_logged_position(self):
+    for seed in range(3):
+      stream = io.StringIO()
+      recorder = GameRecorder(stream)
+      # The board the live AI was given, and its own board with the mines it
+      # had marked left unknown, before every batch of moves
+      positions = []
+      movesPlayed = 0
+      for gameboard, AI, changedTiles in playGames([seed], recorder=recorder):
+        unmarkedBoard = [['X' if tile == '*' else tile for tile in row] for row in AI.AIBoard]
+        positions.append((movesPlayed, [list(row) for row in gameboard.getAIBoard()], unmarkedBoard))
+        movesPlayed += len(gameboard.makeMoves(AI.makeMoves()))
+      stream.seek(0)
+      game = next(readGames(stream))
+      self.assertEqual(len(game), movesPlayed)
+      for moveNumber, boardView, unmarkedBoard in positions:
+        replayedAI = game.getAI(moveNumber)
+        self.assertEqual(replayedAI.AIBoard, boardView)
+        self.assertEqual(replayedAI.AIBoard, unmarkedBoard)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,155 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+import MineSweeperStorage
+from MineSweeperAI import MineSweeperAI
+from MineSweeperArrays import np
+from MineSweeperBoard import MineSweeperBoard
+from MineSweeperStorage import BoardFile, RECORD_HEADER, dumpAIBoard, dumpBoard, loadAIBoard, loadBoard, writeBoardFile
+
+def playBoard(board, moves, seed):
+  #Plays random tiles on a board, leaving it part way through a game
+  generator = random.Random(seed)
+  for move in range(moves):
+    if board.isGameOver():
+      break
+    x, y = generator.randrange(board.xDimension), generator.randrange(board.yDimension)
+    board.makeMoves([(x, y)])
+  return board
+
+def getTiles(board):
+  #Returns the AI view of a list, array or sparse board as a list of lists
+  return [list(row) for row in board.getAIBoard()]
+
+class PackingTest(unittest.TestCase):
+
+  def test_bits_and_nibbles_round_trip(self):
+    generator = random.Random(0)
+    # Odd lengths leave a half-filled byte to pad; both the NumPy and the
+    # pure Python paths must agree
+    for length in (0, 1, 7, 8, 9, 15, 16, 17, 99):
+      bits = [generator.randint(0, 1) for index in range(length)]
+      nibbles = [generator.randint(0, 11) for index in range(length)]
+      for numpy in ((np, None) if np is not None else (None,)):
+        with mock.patch.object(MineSweeperStorage, 'np', numpy):
+          packedBits = MineSweeperStorage._packBits(bits)
+          packedNibbles = MineSweeperStorage._packNibbles(nibbles)
+          self.assertEqual(len(packedBits), (length + 7) // 8)
+          self.assertEqual(len(packedNibbles), (length + 1) // 2)
+          self.assertEqual(MineSweeperStorage._unpackBits(packedBits, length), bits)
+          self.assertEqual(MineSweeperStorage._unpackNibbles(packedNibbles, length), nibbles)
+        if numpy is not None:
+          numpyBits, numpyNibbles = packedBits, packedNibbles
+        else:
+          self.assertEqual((packedBits, packedNibbles), (numpyBits, numpyNibbles))
+
+class RecordTest(unittest.TestCase):
+
+  def assertSameBoard(self, loaded, board):
+    self.assertEqual((loaded.xDimension, loaded.yDimension, loaded.numberMines), (board.xDimension, board.yDimension, board.numberMines))
+    self.assertEqual(sorted(loaded.mineCoordinates), sorted(board.mineCoordinates))
+    self.assertEqual(getTiles(loaded), getTiles(board))
+    self.assertEqual((loaded.movesRemaining, loaded.isGameOver(), loaded.seed), (board.movesRemaining, board.isGameOver(), board.seed))
+
+  def test_boards_round_trip(self):
+    # 7x9 has an odd number of tiles, so the last nibble is padding
+    for seed in range(20):
+      for options in ({}, {'useArrays': True}, {'sparse': True}):
+        if options.get('useArrays') and np is None:
+          continue
+        board = playBoard(MineSweeperBoard(7, 9, 10, verbose=False, seed=seed, **options), seed % 4, seed)
+        record = dumpBoard(board)
+        self.assertEqual(len(record), RECORD_HEADER.size + (63 + 7) // 8 + (63 + 1) // 2)
+        for loadOptions in ({}, {'useArrays': True}, {'sparse': True}):
+          if loadOptions.get('useArrays') and np is None:
+            continue
+          self.assertSameBoard(loadBoard(record, **loadOptions), board)
+
+  def test_loaded_board_plays_on(self):
+    board = playBoard(MineSweeperBoard(9, 9, 10, verbose=False, seed=3), 1, 3)
+    loaded = loadBoard(dumpBoard(board))
+    safeTiles = [(x, y) for x in range(9) for y in range(9) if (x, y) not in board.mineCoordinates and board.AIViewBoard[x][y] == 'X']
+    loaded.makeMoves(safeTiles)
+    self.assertTrue(loaded.isGameOver())
+    self.assertEqual(loaded.movesRemaining, 0)
+
+  def test_AI_boards_round_trip(self):
+    generator = random.Random(5)
+    gameboard = MineSweeperBoard(16, 30, 99, verbose=False, rng=generator)
+    AI = MineSweeperAI(16, 30, 99, verbose=False, seed=12)
+    for move in range(4):
+      AI.updateAIViewBoard(gameboard.getAIBoard(), gameboard.getChangedTiles())
+      gameboard.makeMoves(AI.makeMoves())
+    record = dumpAIBoard(AI)
+    with self.assertRaises(ValueError):
+      loadBoard(record)
+    loaded = loadAIBoard(record)
+    self.assertEqual(loaded.AIBoard, AI.AIBoard)
+    self.assertEqual(loaded.seed, 12)
+    self.assertEqual((loaded.unknownTiles, loaded.markedMines), (AI.unknownTiles, AI.markedMines))
+
+class BoardFileTest(unittest.TestCase):
+
+  def setUp(self):
+    descriptor, self.path = tempfile.mkstemp(suffix='.mswb')
+    os.close(descriptor)
+
+  def tearDown(self):
+    os.remove(self.path)
+
+  def test_records_are_indexed(self):
+    boards = [playBoard(MineSweeperBoard(5 + seed, 8, 6, verbose=False, seed=seed), seed % 3, seed) for seed in range(6)]
+    AI = MineSweeperAI(5, 8, 6, verbose=False, seed=4)
+    AI.updateAIViewBoard(boards[0].getAIBoard())
+    self.assertEqual(writeBoardFile(self.path, boards + [AI, dumpBoard(boards[1])]), 8)
+    with BoardFile(self.path) as boardFile:
+      self.assertEqual(len(boardFile), 8)
+      for boardNumber, board in enumerate(boards):
+        self.assertEqual(boardFile.getRecord(boardNumber), dumpBoard(board))
+        self.assertEqual(getTiles(boardFile[boardNumber]), getTiles(board))
+        self.assertEqual(getTiles(boardFile[boardNumber - 8]), getTiles(board))
+      self.assertEqual(boardFile.getRecord(-1), dumpBoard(boards[1]))
+      self.assertEqual(boardFile.loadAIBoard(6).AIBoard, AI.AIBoard)
+      self.assertEqual(boardFile.loadAIBoard(-2).seed, 4)
+      for boardNumber in (8, -9):
+        with self.assertRaises(IndexError):
+          boardFile.getRecord(boardNumber)
+
+  def test_iteration_loads_every_board(self):
+    boards = [playBoard(MineSweeperBoard(6, 7, 8, verbose=False, seed=seed), 2, seed) for seed in range(5)]
+    writeBoardFile(self.path, boards)
+    with BoardFile(self.path) as boardFile:
+      self.assertEqual([getTiles(board) for board in boardFile], [getTiles(board) for board in boards])
+
+  def test_empty_board_file(self):
+    self.assertEqual(writeBoardFile(self.path, []), 0)
+    with BoardFile(self.path) as boardFile:
+      self.assertEqual(len(boardFile), 0)
+      self.assertEqual(list(boardFile), [])
+      with self.assertRaises(IndexError):
+        boardFile.getRecord(0)
+
+  def test_other_files_are_rejected(self):
+    for contents in (b'', b'MSW', b'not a board file at all'):
+      with open(self.path, 'wb') as otherFile:
+        otherFile.write(contents)
+      with self.assertRaises(ValueError):
+        BoardFile(self.path)
+
+class LoadAIBoardTest(unittest.TestCase):
+
+  def test_game_record_seed_does_not_seed_the_AI(self):
+    losses = 0
+    for seed in range(50):
+      record = dumpBoard(MineSweeperBoard(16, 30, 99, verbose=False, seed=seed))
+      gameboard = loadBoard(record)
+      AI = loadAIBoard(record)
+      self.assertIsNone(AI.seed)
+      moves = AI.makeMoves()
+      losses += any(move in gameboard.mineCoordinates for move in moves)
+    self.assertLess(losses, 25)
+
+if __name__ == '__main__':
+  unittest.main()